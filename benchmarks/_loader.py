@@ -0,0 +1,30 @@
+"""Entegrasyon modüllerini Home Assistant kurulu olmadan yükler.
+
+Paketin __init__.py dosyası homeassistant import ettiği için paket modülü
+çalıştırılmadan sys.modules'e eklenir; api, parser, models gibi HA'dan
+bağımsız alt modüller normal şekilde import edilebilir.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.haswave_nobetci_eczane"
+PACKAGE_DIR = ROOT / "custom_components" / "haswave_nobetci_eczane"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def load(module: str) -> ModuleType:
+    """Örn. load("api") -> custom_components.haswave_nobetci_eczane.api"""
+    if PACKAGE not in sys.modules:
+        for name, path in (
+            ("custom_components", ROOT / "custom_components"),
+            (PACKAGE, PACKAGE_DIR),
+        ):
+            package = ModuleType(name)
+            package.__path__ = [str(path)]
+            sys.modules[name] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
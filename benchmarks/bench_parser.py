@@ -0,0 +1,149 @@
+"""Parser benchmark'ı: fixture sayfaları üzerinde süre, bellek ve golden JSON kontrolü.
+
+Tamamen çevrimdışı çalışır; Home Assistant gerekmez (beautifulsoup4 gerekir).
+
+    python benchmarks/bench_parser.py
+    python benchmarks/bench_parser.py --engine stream --repeat 200
+    python benchmarks/bench_parser.py --fixture large_metropolitan --limit 60 --json
+
+Golden çıktıdan farklı sonuç üreten motor olursa çıkış kodu 1'dir.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+from _loader import FIXTURES_DIR, load
+
+api = load("api")
+
+ENGINES = (api.PARSER_ENGINE_STREAM, api.PARSER_ENGINE_BS4)
+
+
+@dataclass
+class Result:
+    fixture: str
+    engine: str
+    size_bytes: int
+    pharmacies: int
+    best_ms: float
+    median_ms: float
+    per_pharmacy_us: float
+    allocations: int
+    allocated_kib: float
+    peak_kib: float
+    golden: str
+
+
+def _measure_memory(html: str, limit: int, city: str, county: str, engine: str) -> tuple[int, float, float]:
+    """Tek parse için (ayırma sayısı, toplam ayrılan KiB, tepe KiB).
+
+    Ayırmalar parse bitince hâlâ yaşayan bloklardır (sonuç + henüz toplanmamış
+    ara nesneler); tepe değeri parse sırasındaki en yüksek bellek kullanımıdır.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = api.parse_pharmacies(html, limit, city, county, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = [stat for stat in after.compare_to(before, "traceback") if stat.count_diff > 0]
+    del result
+    return (
+        sum(stat.count_diff for stat in diff),
+        sum(stat.size_diff for stat in diff) / 1024,
+        peak / 1024,
+    )
+
+
+def bench(fixture: str, engine: str, repeat: int, limit: int | None) -> Result:
+    html = (FIXTURES_DIR / f"{fixture}.html").read_text(encoding="utf-8")
+    expected = json.loads((FIXTURES_DIR / f"{fixture}.json").read_text(encoding="utf-8"))
+    city, county = expected["city"], expected["county"]
+    run_limit = limit or expected["limit"]
+
+    result = api.parse_pharmacies(html, run_limit, city, county, engine)
+    if run_limit != expected["limit"]:
+        golden = "atlandı"
+    elif [pharmacy.as_dict() for pharmacy in result] == expected["pharmacies"]:
+        golden = "ok"
+    else:
+        golden = "FARKLI"
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        api.parse_pharmacies(html, run_limit, city, county, engine)
+        timings.append(time.perf_counter() - start)
+    allocations, allocated_kib, peak_kib = _measure_memory(html, run_limit, city, county, engine)
+    median = statistics.median(timings)
+    return Result(
+        fixture=fixture,
+        engine=engine,
+        size_bytes=len(html.encode()),
+        pharmacies=len(result),
+        best_ms=min(timings) * 1000,
+        median_ms=median * 1000,
+        per_pharmacy_us=median * 1e6 / len(result) if result else 0.0,
+        allocations=allocations,
+        allocated_kib=allocated_kib,
+        peak_kib=peak_kib,
+        golden=golden,
+    )
+
+
+def _print_table(results: list[Result]) -> None:
+    header = (
+        f"{'fixture':<20} {'motor':<7} {'bayt':>7} {'ecz':>4} {'en iyi ms':>10} "
+        f"{'medyan ms':>10} {'µs/ecz':>8} {'ayırma':>8} {'KiB':>8} {'tepe KiB':>9}  golden"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.fixture:<20} {r.engine:<7} {r.size_bytes:>7} {r.pharmacies:>4} {r.best_ms:>10.3f} "
+            f"{r.median_ms:>10.3f} {r.per_pharmacy_us:>8.1f} {r.allocations:>8} "
+            f"{r.allocated_kib:>8.1f} {r.peak_kib:>9.1f}  {r.golden}"
+        )
+    by_fixture: dict[str, dict[str, Result]] = {}
+    for r in results:
+        by_fixture.setdefault(r.fixture, {})[r.engine] = r
+    for fixture, engines in by_fixture.items():
+        if len(engines) > 1 and engines.get(api.PARSER_ENGINE_STREAM) and engines.get(api.PARSER_ENGINE_BS4):
+            stream, bs4 = engines[api.PARSER_ENGINE_STREAM], engines[api.PARSER_ENGINE_BS4]
+            if stream.median_ms:
+                print(f"{fixture}: stream, bs4'ten {bs4.median_ms / stream.median_ms:.1f}x hızlı")
+
+
+def main() -> int:
+    fixtures = sorted(path.stem for path in FIXTURES_DIR.glob("*.html"))
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", action="append", choices=fixtures, help="varsayılan: hepsi")
+    parser.add_argument("--engine", action="append", choices=ENGINES, help="varsayılan: hepsi")
+    parser.add_argument("--repeat", type=int, default=50, help="zamanlama tekrarı (varsayılan: 50)")
+    parser.add_argument("--limit", type=int, help="golden limit yerine (golden kontrolü atlanır)")
+    parser.add_argument("--json", action="store_true", help="sonuçları JSON olarak yaz")
+    args = parser.parse_args()
+
+    results = [
+        bench(fixture, engine, max(1, args.repeat), args.limit)
+        for fixture in args.fixture or fixtures
+        for engine in args.engine or ENGINES
+    ]
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], ensure_ascii=False, indent=2))
+    else:
+        _print_table(results)
+    return 1 if any(r.golden == "FARKLI" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""eczaneleri.net new-iframe uç noktasını taklit eden yerel aiohttp sunucusu.
+
+Fixture sayfalarını gecikme, hata oranı, yavaş (parça parça) gövde ve ETag
+davranışı ayarlanabilir şekilde sunar. Yük testi ve zaman aşımı / eşzamanlılık
+ayarı için gerçek siteye istek atmadan fetch katmanını çalıştırır.
+
+    python benchmarks/fake_upstream.py --port 8080 --latency 150 --error-rate 0.05 --etag
+
+İstemcide URL şablonu:
+    http://127.0.0.1:8080/api/new-iframe?city={city}&county={county}
+İstatistikler: GET /stats
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import random
+from dataclasses import asdict, dataclass, field
+
+from aiohttp import web
+
+from _loader import FIXTURES_DIR
+
+URL_PATH = "/api/new-iframe"
+
+
+@dataclass
+class UpstreamConfig:
+    # Ortalama yanıt gecikmesi ve ± sapma (milisaniye)
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # 500 dönen isteklerin oranı (0-1)
+    error_rate: float = 0.0
+    # Yanıtı hiç döndürmeden bekleyen isteklerin oranı (istemci zaman aşımı testi)
+    hang_rate: float = 0.0
+    hang_seconds: float = 60.0
+    # Yavaş gövde: drip_bytes'lık parçalar arasında drip_delay_ms beklenir (0: kapalı)
+    drip_bytes: int = 0
+    drip_delay_ms: float = 0.0
+    # ETag gönder ve If-None-Match eşleşirse 304 dön
+    etag: bool = False
+    # İl geneli (ilçe == il) sayfalar için büyük, diğerleri için küçük fixture
+    district_fixture: str = "small_district"
+    province_fixture: str = "large_metropolitan"
+    seed: int | None = None
+
+
+@dataclass
+class UpstreamStats:
+    requests: int = 0
+    ok: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    hangs: int = 0
+    bytes_sent: int = 0
+    # İstemci gövdenin tamamını okumadan bağlantıyı kapattı (erken kesme)
+    aborted: int = 0
+    locations: dict[str, int] = field(default_factory=dict)
+
+
+class FakeUpstream:
+    """Sunucu durumu: yapılandırma, fixture gövdeleri ve sayaçlar."""
+
+    def __init__(self, config: UpstreamConfig) -> None:
+        self.config = config
+        self.stats = UpstreamStats()
+        self._rng = random.Random(config.seed)
+        self._bodies: dict[str, tuple[bytes, str]] = {}
+        for name in (config.district_fixture, config.province_fixture):
+            body = (FIXTURES_DIR / f"{name}.html").read_bytes()
+            self._bodies[name] = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(URL_PATH, self._handle_iframe)
+        app.router.add_get("/stats", self._handle_stats)
+        return app
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(asdict(self.stats))
+
+    async def _handle_iframe(self, request: web.Request) -> web.StreamResponse:
+        config, stats = self.config, self.stats
+        stats.requests += 1
+        city = request.query.get("city", "")
+        county = request.query.get("county", "")
+        location = f"{city}/{county}"
+        stats.locations[location] = stats.locations.get(location, 0) + 1
+
+        delay = config.latency_ms + self._rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        roll = self._rng.random()
+        if roll < config.hang_rate:
+            stats.hangs += 1
+            await asyncio.sleep(config.hang_seconds)
+        if self._rng.random() < config.error_rate:
+            stats.errors += 1
+            return web.Response(status=500, text="Internal Server Error")
+
+        fixture = config.province_fixture if city == county else config.district_fixture
+        body, etag = self._bodies[fixture]
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if config.etag:
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                stats.not_modified += 1
+                return web.Response(status=304, headers={"ETag": etag})
+
+        if not config.drip_bytes:
+            stats.ok += 1
+            stats.bytes_sent += len(body)
+            return web.Response(body=body, headers=headers)
+
+        response = web.StreamResponse(headers=headers)
+        response.content_length = len(body)
+        await response.prepare(request)
+        try:
+            for start in range(0, len(body), config.drip_bytes):
+                chunk = body[start : start + config.drip_bytes]
+                await response.write(chunk)
+                stats.bytes_sent += len(chunk)
+                await asyncio.sleep(config.drip_delay_ms / 1000)
+            await response.write_eof()
+        except (ConnectionResetError, asyncio.CancelledError):
+            stats.aborted += 1
+            raise
+        stats.ok += 1
+        return response
+
+
+async def async_start(config: UpstreamConfig, host: str = "127.0.0.1", port: int = 0) -> tuple[web.AppRunner, FakeUpstream, str]:
+    """Sunucuyu başlatır; (runner, upstream, URL şablonu) döner. port=0 boş port seçer."""
+    upstream = FakeUpstream(config)
+    runner = web.AppRunner(upstream.app(), handle_signals=False)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    return runner, upstream, f"http://{host}:{bound_port}{URL_PATH}?city={{city}}&county={{county}}"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.0, help="ortalama gecikme (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="gecikme sapması ± (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 oranı (0-1)")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="yanıt vermeme oranı (0-1)")
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--drip-bytes", type=int, default=0, help="yavaş gövde parça boyutu (bayt)")
+    parser.add_argument("--drip-delay", type=float, default=0.0, help="parçalar arası bekleme (ms)")
+    parser.add_argument("--etag", action="store_true", help="ETag / 304 desteği")
+    parser.add_argument("--seed", type=int)
+
+
+def config_from_args(args: argparse.Namespace) -> UpstreamConfig:
+    return UpstreamConfig(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        drip_bytes=args.drip_bytes,
+        drip_delay_ms=args.drip_delay,
+        etag=args.etag,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_arguments(parser)
+    args = parser.parse_args()
+    upstream = FakeUpstream(config_from_args(args))
+    print(f"URL şablonu: http://{args.host}:{args.port}{URL_PATH}?city={{city}}&county={{county}}")
+    web.run_app(upstream.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
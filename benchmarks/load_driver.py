@@ -0,0 +1,198 @@
+"""Fetch katmanı için yük sürücüsü: çok sayıda sanal config entry ve gecikme ölçümü.
+
+Her sanal entry bir HasWaveEczaneAPI ile kendi aralığında veri çeker (tümü tek
+aiohttp session'ı paylaşır). --shared ile aynı (il, ilçe) entry'leri tek
+poller'ı paylaşır (entegrasyondaki ortak koordinatör gibi). Sonunda fetch
+gecikmesi yüzdelikleri ve event loop gecikmesi (lag) raporlanır.
+
+    # Yerel sahte sunucuyu kendisi başlatır
+    python benchmarks/load_driver.py --entries 200 --locations 40 --duration 30 \\
+        --interval 2 --latency 120 --jitter 80 --error-rate 0.02 --etag
+
+    # Ayrı çalışan bir sunucuya karşı
+    python benchmarks/load_driver.py --url "http://127.0.0.1:8080/api/new-iframe?city={city}&county={county}"
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlsplit
+
+from aiohttp import ClientSession, TCPConnector
+
+import fake_upstream
+from _loader import load
+
+api = load("api")
+resilience = load("resilience")
+
+
+@dataclass
+class LoadReport:
+    pollers: int
+    duration_s: float
+    fetches: int = 0
+    failures: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+    loop_lag_ms: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "pollers": self.pollers,
+            "duration_s": round(self.duration_s, 1),
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "fetches_per_s": round(self.fetches / self.duration_s, 1) if self.duration_s else 0,
+            "latency_ms": percentiles(self.latencies_ms),
+            "loop_lag_ms": percentiles(self.loop_lag_ms),
+            "parse": asdict(api.PARSE_STATS),
+        }
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50 / p90 / p99 / max (en yakın sıra yöntemi)."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, max(0, int(p * len(ordered) + 0.5) - 1))], 2)
+
+    return {"p50": rank(0.50), "p90": rank(0.90), "p99": rank(0.99), "max": round(ordered[-1], 2)}
+
+
+def build_locations(count: int, province_share: float, rng: random.Random) -> list[tuple[str, str]]:
+    """count adet (il, ilçe); province_share oranında il geneli (ilçe = il)."""
+    locations = []
+    for i in range(count):
+        city = f"İL{i // 10}"
+        locations.append((city, city if rng.random() < province_share else f"İLÇE{i}"))
+    return locations
+
+
+async def _poll(
+    session: ClientSession,
+    client: "api.HasWaveEczaneAPI",
+    interval: float,
+    deadline: float,
+    report: LoadReport,
+    rng: random.Random,
+) -> None:
+    # Entry'ler aynı anda başlamasın (HA'da kurulum zamanları farklıdır)
+    await asyncio.sleep(rng.uniform(0, interval))
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        result = await client.async_fetch(session)
+        report.latencies_ms.append((time.perf_counter() - start) * 1000)
+        report.fetches += 1
+        if result is None:
+            report.failures += 1
+        await asyncio.sleep(interval)
+
+
+async def _monitor_lag(report: LoadReport, stop: asyncio.Event, period: float = 0.05) -> None:
+    """Event loop'un planlanan uyanmaya ne kadar geç kaldığını örnekler."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(period)
+        report.loop_lag_ms.append(max(0.0, (loop.time() - start - period) * 1000))
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    runner = upstream = None
+    if args.url:
+        template = args.url
+    else:
+        runner, upstream, template = await fake_upstream.async_start(fake_upstream.config_from_args(args))
+    # Fetch katmanı URL şablonunu her istekte modül sabitinden okur
+    api.ECZANELERI_NET_URL = template
+    # Varsayılan olarak fetch katmanı ölçülür; --rate-limit ile entegrasyonun istek sınırı
+    limiter = resilience.get_rate_limiter(urlsplit(template).hostname or "")
+    limiter.rate = args.rate_limit or float("inf")
+    limiter.burst = resilience.RATE_LIMIT_BURST if args.rate_limit else 10**9
+    limiter.tokens = float(limiter.burst)
+
+    locations = build_locations(args.locations, args.province_share, rng)
+    entries = [(locations[i % len(locations)], rng.randint(1, args.max_sensors)) for i in range(args.entries)]
+    if args.shared:
+        limits: dict[tuple[str, str], int] = {}
+        for location, limit in entries:
+            limits[location] = max(limit, limits.get(location, 0))
+        entries = list(limits.items())
+
+    report = LoadReport(pollers=len(entries), duration_s=args.duration)
+    stop = asyncio.Event()
+    deadline = time.monotonic() + args.duration
+    lag_task = asyncio.create_task(_monitor_lag(report, stop))
+    started = time.monotonic()
+    async with ClientSession(connector=TCPConnector(limit=args.connections)) as session:
+        await asyncio.gather(
+            *(
+                _poll(session, api.HasWaveEczaneAPI(city, district, limit), args.interval, deadline, report, rng)
+                for (city, district), limit in entries
+            )
+        )
+    stop.set()
+    await lag_task
+    report.duration_s = time.monotonic() - started
+
+    summary = report.summary()
+    if upstream is not None:
+        summary["upstream"] = {k: v for k, v in asdict(upstream.stats).items() if k != "locations"}
+        await runner.cleanup()
+    return summary
+
+
+def _print_summary(summary: dict) -> None:
+    print(
+        f"{summary['pollers']} poller, {summary['duration_s']} sn: {summary['fetches']} fetch "
+        f"({summary['fetches_per_s']}/sn), {summary['failures']} başarısız"
+    )
+    for key, title in (("latency_ms", "Fetch gecikmesi (ms)"), ("loop_lag_ms", "Event loop lag (ms)")):
+        values = summary[key]
+        print(f"{title:<22} " + "  ".join(f"{name}={value}" for name, value in values.items()))
+    parse = summary["parse"]
+    print(
+        f"Parse: inline {parse['inline_count']} ({parse['inline_seconds'] * 1000:.1f} ms), "
+        f"executor {parse['executor_count']} ({parse['executor_seconds'] * 1000:.1f} ms)"
+    )
+    if "upstream" in summary:
+        print("Sunucu: " + ", ".join(f"{k}={v}" for k, v in summary["upstream"].items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="hazır sunucunun URL şablonu (verilmezse yerel sahte sunucu başlatılır)")
+    parser.add_argument("--entries", type=int, default=50, help="sanal config entry sayısı")
+    parser.add_argument("--locations", type=int, default=20, help="farklı (il, ilçe) sayısı")
+    parser.add_argument("--province-share", type=float, default=0.2, help="il geneli entry oranı")
+    parser.add_argument("--max-sensors", type=int, default=5, help="entry başına en fazla eczane (1-20)")
+    parser.add_argument("--shared", action="store_true", help="aynı konumdaki entry'ler tek fetch paylaşır")
+    parser.add_argument("--interval", type=float, default=5.0, help="entry başına fetch aralığı (sn)")
+    parser.add_argument("--duration", type=float, default=20.0, help="test süresi (sn)")
+    parser.add_argument("--connections", type=int, default=100, help="session bağlantı havuzu sınırı")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="sunucu başına istek/sn sınırı (0: sınırsız)"
+    )
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yaz")
+    parser.add_argument("--verbose", action="store_true", help="entegrasyon loglarını göster")
+    fake_upstream.add_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    summary = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        _print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
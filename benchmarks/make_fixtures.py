@@ -0,0 +1,134 @@
+"""Benchmark fixture'larını (iframe HTML sayfaları) ve golden JSON dosyalarını üretir.
+
+Sayfalar eczaneleri.net new-iframe çıktısının yapısını (list-group blokları,
+tel: / Google Maps / eczaneleri.net linkleri, script/style, ikonlar) taklit
+eden sabit tohumlu sentetik sayfalardır; her çalıştırmada aynı içerik üretilir.
+
+    python benchmarks/make_fixtures.py            # HTML + golden JSON yaz
+    python benchmarks/make_fixtures.py --golden   # sadece golden JSON'u yenile
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+from _loader import FIXTURES_DIR, load
+
+# fixture adı -> (il, ilçe, eczane sayısı, golden limit)
+FIXTURES: dict[str, tuple[str, str, int, int]] = {
+    "small_district": ("EDİRNE", "KEŞAN", 3, 20),
+    "large_metropolitan": ("İSTANBUL", "İSTANBUL", 60, 20),
+    "empty": ("BAYBURT", "AYDINTEPE", 0, 20),
+    "malformed": ("TEKİRDAĞ", "ÇORLU", 8, 20),
+}
+
+_NAMES = (
+    "YILDIZ", "ŞİFA", "HAYAT", "GÜVEN", "ÇINAR", "IŞIK", "DENİZ", "ÖZGÜR", "SAĞLIK",
+    "ATAKENT", "MERKEZ", "GÜNEŞ", "İLKE", "NİL", "PARK", "YENİ", "ÜMİT", "DOĞA",
+)
+_STREETS = ("ATATÜRK CAD.", "CUMHURİYET BLV.", "İSTİKLAL SK.", "GAZİ MUSTAFA KEMAL CAD.", "İNÖNÜ SK.")
+_QUARTERS = ("CUMHURİYET MAH.", "YENİ MAH.", "FATİH MAH.", "BARBAROS MAH.", "ÇARŞI MAH.")
+_ISTANBUL_DISTRICTS = ("KADIKÖY", "ÜSKÜDAR", "BEŞİKTAŞ", "ŞİŞLİ", "BAKIRKÖY", "ESENYURT", "ÜMRANİYE")
+
+_HEAD = """<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8">
+<title>Nöbetçi Eczaneler</title>
+<link rel="stylesheet" href="https://eczaneleri.net/css/bootstrap.min.css">
+<style>.list-group-item.active{{background:#{color1};border-color:#{color2}}}</style>
+<script>window.dataLayer=window.dataLayer||[];function gtag(){{dataLayer.push(arguments);}}</script>
+</head><body>
+<div class="container-fluid p-0">
+<div class="alert alert-info mb-2">{city} / {county} nöbetçi eczaneleri &ndash; {date}</div>
+"""
+_FOOT = """<p class="small text-muted text-center">Kaynak: <a href="https://eczaneleri.net" target="_blank">eczaneleri.net</a></p>
+</div></body></html>
+"""
+_BLOCK = """<ul class="list-group list-group-flush mb-3">
+  <li class="list-group-item active"><a href="https://{slug_city}.eczaneleri.net/{slug}" target="_blank"><i class="fa fa-plus-square"></i> <b>{name}</b></a></li>
+  <li class="list-group-item"><i class="fa fa-map-marker"></i> {address}</li>
+  <li class="list-group-item"><a href="tel:{phone}"><i class="fa fa-phone"></i> {phone_fmt}</a></li>
+  <li class="list-group-item"><a href="https://www.google.com/maps?q={lat:.6f},{lon:.6f}" target="_blank"><i class="fa fa-location-arrow"></i> Yol Tarifi</a></li>
+</ul>
+"""
+_SLUG = str.maketrans("çğıöşüÇĞİÖŞÜ ", "cgiosuCGIOSU-")
+
+
+def _slug(text: str) -> str:
+    return text.translate(_SLUG).lower()
+
+
+def _block(rng: random.Random, city: str, county: str, index: int) -> str:
+    name = f"{rng.choice(_NAMES)} {'ECZANESİ' if index % 7 else 'ECZANESİ &amp; PARFÜMERİ'}"
+    district = rng.choice(_ISTANBUL_DISTRICTS) if county == city else county
+    address = (
+        f"{rng.choice(_QUARTERS)} {rng.choice(_STREETS)} NO:{rng.randint(1, 250)}"
+        f"{rng.choice(('', '/A', '/B'))} {district}/{city}"
+    )
+    phone = f"0{rng.choice((212, 216, 282, 284))}{rng.randint(1000000, 9999999)}"
+    return _BLOCK.format(
+        slug_city=_slug(city),
+        slug=_slug(name.replace(" &amp; ", " ")) + f"-{index}",
+        name=name,
+        address=address,
+        phone=phone,
+        phone_fmt=f"{phone[:4]} {phone[4:7]} {phone[7:]}",
+        lat=40.9 + rng.random() * 0.3,
+        lon=28.6 + rng.random() * 0.8,
+    )
+
+
+def build_page(name: str) -> str:
+    city, county, count, _ = FIXTURES[name]
+    rng = random.Random(name)
+    parts = [_HEAD.format(city=city, county=county, date="18.10.2026", color1="00d2d3", color2="17a2b8")]
+    if not count:
+        parts.append('<div class="alert alert-warning">Bu bölge için nöbetçi eczane bulunamadı.</div>\n')
+    parts.extend(_block(rng, city, county, i) for i in range(count))
+    parts.append(_FOOT)
+    html = "".join(parts)
+    if name == "malformed":
+        # Kapanmamış li/ul, başıboş kapanış etiketleri, bozuk entity ve yarıda kesilmiş gövde
+        html = (
+            html.replace("</li>\n  <li class=\"list-group-item\"><i class=\"fa fa-map", "\n  <li class=\"list-group-item\"><i class=\"fa fa-map", 3)
+            .replace("</ul>\n<ul", "</span></br>\n<ul", 2)
+            .replace("&amp;", "&amp", 1)
+        )
+        html = html[: html.rindex("<ul")] + '<ul class="list-group"><li><a href="https://x.eczaneleri.net/yarim">YARIM KAL'
+    return html
+
+
+def golden(name: str, html: str) -> dict:
+    api = load("api")
+    city, county, _, limit = FIXTURES[name]
+    pharmacies = api.parse_pharmacies(html, limit, city, county, api.PARSER_ENGINE_BS4)
+    return {
+        "city": city,
+        "county": county,
+        "limit": limit,
+        "pharmacies": [pharmacy.as_dict() for pharmacy in pharmacies],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--golden", action="store_true", help="HTML'e dokunmadan golden JSON'u yenile")
+    args = parser.parse_args()
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    for name in FIXTURES:
+        html_path = FIXTURES_DIR / f"{name}.html"
+        if args.golden:
+            html = html_path.read_text(encoding="utf-8")
+        else:
+            html = build_page(name)
+            html_path.write_text(html, encoding="utf-8")
+        data = golden(name, html)
+        Path(FIXTURES_DIR / f"{name}.json").write_text(
+            json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"{name}: {len(html.encode())} bayt, {len(data['pharmacies'])} eczane")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,41 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DEFAULT_UPDATE_INTERVAL, DOMAIN
-from .api import HasWaveEczaneAPI
+from .cache import async_get_roster_cache
+from .client import async_close_http_client
+from .const import (
+    CONF_ENTITY_MODE,
+    CONF_FULL_ROSTER,
+    CONF_TRACKED_ENTITY,
+    DATA_COORDINATORS,
+    DEFAULT_ENTITY_MODE,
+    DEFAULT_TRACKED_ENTITY,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+)
+from .coordinator import async_acquire_coordinator, async_release_coordinator
+from .services import async_setup_services
+from .util import location_key, split_districts
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BUTTON]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Entegrasyon geneli servisleri kaydet."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up HasWave Nöbetçi Eczane from a config entry."""
@@ -27,49 +47,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sensor_count = max(1, min(20, int(sensor_count)))
     except (TypeError, ValueError):
         sensor_count = 5
-    api = HasWaveEczaneAPI(
-        city=data.get("city", ""),
-        district=data.get("district", ""),
-        limit=sensor_count,
-    )
-
-    async def async_update_data():
-        """Eczaneleri.net iframe'den veri çek (aiohttp)."""
-        try:
-            session = async_get_clientsession(hass)
-            result = await api.async_fetch(session)
-            if result is not None:
-                _LOGGER.debug("Eczaneleri.net: %s eczane verisi alındı", len(result))
-            else:
-                _LOGGER.warning("Eczaneleri.net veri alınamadı")
-            return result if result is not None else []
-        except Exception as err:
-            _LOGGER.error("Veri güncelleme hatası: %s", err, exc_info=True)
-            return []
-
     update_interval = opts.get("update_interval", data.get("update_interval", DEFAULT_UPDATE_INTERVAL))
     try:
         update_interval = int(update_interval)
     except (TypeError, ValueError):
         update_interval = DEFAULT_UPDATE_INTERVAL
-    coordinator = DataUpdateCoordinator(
+
+    # Aynı il/ilçe için tüm entry'ler tek koordinatörü (tek fetch) paylaşır
+    coordinator = await async_acquire_coordinator(
         hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=update_interval),
+        entry.entry_id,
+        city=data.get("city", ""),
+        district=data.get("district", ""),
+        limit=sensor_count,
+        update_interval=update_interval,
+        # Arama / en yakın eczane için tüm liste; il geneli entry'lerde varsayılan açık
+        full_roster=opts.get(CONF_FULL_ROSTER, not split_districts(data.get("district"))),
     )
-    
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as err:
-        _LOGGER.error(f"İlk veri yükleme hatası: {err}")
-        # Hata olsa bile devam et, sensor'lar oluşturulsun
-    
+    if not coordinator.last_update_success:
+        _LOGGER.error("İlk veri yükleme hatası: %s", coordinator.last_exception)
+        # Hata olsa bile devam et, sensor'lar oluşturulsun (kullanılamaz görünür)
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
-        "api": api,
+        "api": coordinator.api,
         "sensor_count": sensor_count,
+        "tracked_entity": opts.get(CONF_TRACKED_ENTITY) or DEFAULT_TRACKED_ENTITY,
+        "entity_mode": opts.get(CONF_ENTITY_MODE, DEFAULT_ENTITY_MODE),
     }
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -86,7 +90,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await async_release_coordinator(hass, entry.entry_id, entry_data["coordinator"])
+        if not hass.data[DOMAIN].get(DATA_COORDINATORS):
+            # Son entry: havuzdaki bağlantılar HA kapanışına kadar açık kalmasın
+            await async_close_http_client(hass)
     
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Entry silindi: konumu başka entry kullanmıyorsa diskteki son liste kaydını sil."""
+    key = location_key(entry.data.get("city", ""), entry.data.get("district", ""))
+    for other in hass.config_entries.async_entries(DOMAIN):
+        if other.entry_id != entry.entry_id and location_key(
+            other.data.get("city", ""), other.data.get("district", "")
+        ) == key:
+            return
+    roster_cache = await async_get_roster_cache(hass)
+    roster_cache.async_remove(key)
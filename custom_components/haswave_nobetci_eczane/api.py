@@ -1,14 +1,48 @@
 """Eczaneleri.net iframe kaynağından nöbetçi eczane verisi çeker."""
 from __future__ import annotations
 
+import asyncio
+import codecs
+import hashlib
+import importlib
+import importlib.util
 import logging
 import re
-from typing import Any
-from urllib.parse import quote
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, NamedTuple
+from urllib.parse import quote, urlsplit
 
-from bs4 import BeautifulSoup
-
-from .const import ECZANELERI_NET_URL
+from .catalog import canonical_location
+from .const import (
+    DEFAULT_FETCH_CONCURRENCY,
+    ECZANELERI_NET_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_TOTAL_TIMEOUT,
+    PARSE_INLINE_MAX_BYTES,
+    PARSER_ENGINE_BS4,
+    PARSER_ENGINE_STREAM,
+    ROSTER_FETCH_LIMIT,
+    STREAM_CHUNK_SIZE,
+)
+from .models import Pharmacy
+from .parser import (
+    AnchorRef,
+    EczaneHTMLParser,
+    ListItemFields,
+    address_exclusions,
+    build_item,
+    parse_eczaneleri_net_html_stream,
+)
+from .providers import Provider, async_fetch_hedged, get_providers, register_provider
+from .resilience import CircuitOpenError, async_call_with_retry, get_breaker, get_rate_limiter
+from .util import split_districts
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,21 +52,67 @@ USER_AGENT = (
 )
 
 
-def _normalize_phone(phone: str) -> str:
-    digits = "".join(filter(str.isdigit, phone))
-    if len(digits) == 12 and digits.startswith("90"):
-        digits = "0" + digits[2:]
-    return digits or phone
+@lru_cache(maxsize=1)
+def accept_encoding() -> str:
+    """Açabildiğimiz sıkıştırmalar; brotli yalnızca modülü kuruluysa istenir."""
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+def request_headers() -> dict[str, str]:
+    return {"User-Agent": USER_AGENT, "Accept-Encoding": accept_encoding()}
+
+
+@lru_cache(maxsize=1)
+def request_timeout():
+    """Bağlantı ve okuma için ayrı sınırlı aiohttp ClientTimeout (bir kez oluşturulur)."""
+    from aiohttp import ClientTimeout
+    return ClientTimeout(
+        total=HTTP_TOTAL_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT, sock_read=HTTP_READ_TIMEOUT
+    )
+
+
+def _wire_size(resp, size: int) -> int | None:
+    """Tam okunan gövdenin ağdan gelen boyutu; sıkıştırılmış ve uzunluğu bilinmiyorsa None."""
+    encoding = resp.headers.get("Content-Encoding", "").strip().lower()
+    if not encoding or encoding == "identity":
+        return size
+    return resp.content_length
+
+
+# Ağır bağımlılığın (bs4) ilk import süresi (saniye)
+IMPORT_SECONDS: dict[str, float] = {}
+
+
+def _lazy_import(name: str) -> ModuleType:
+    """Modülü ilk kullanımda import eder ve süresini kaydeder.
+
+    Event loop'u bloklamamak için ilk çağrı executor'da yapılmalıdır
+    (bkz. async_parse_pharmacies).
+    """
+    if name not in sys.modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        IMPORT_SECONDS[name] = time.perf_counter() - start
+        _LOGGER.debug("%s import edildi: %.1f ms", name, IMPORT_SECONDS[name] * 1000)
+    return importlib.import_module(name)
 
 
 def _parse_eczaneleri_net_html(
     html: str, limit: int, il_adi: str, ilce_adi: str
-) -> list[dict[str, Any]]:
+) -> list[Pharmacy]:
     """
     Eczaneleri.net iframe HTML'ini parse eder.
     İçeriğe göre eşleştirir: tel: -> phone, maps -> map_link, eczaneleri.net link -> name, uzun metin -> address.
+    Alan kuralları parser.ANCHOR_RULES ve ilgili sabitlerde tanımlıdır.
     """
-    pharmacies: list[dict[str, Any]] = []
+    pharmacies: list[Pharmacy] = []
+    try:
+        BeautifulSoup = _lazy_import("bs4").BeautifulSoup
+    except ImportError as e:
+        _LOGGER.warning("BeautifulSoup motoru kullanılamıyor (beautifulsoup4 kurulu değil): %s", e)
+        return []
     try:
         soup = BeautifulSoup(html, "html.parser")
     except Exception as e:
@@ -51,6 +131,7 @@ def _parse_eczaneleri_net_html(
         # Alternatif: class içinde "list" geçen ul
         ul_list = soup.find_all("ul", class_=re.compile(r"list", re.I))
 
+    exclusions = address_exclusions(il_adi)
     for ul in ul_list:
         if len(pharmacies) >= limit:
             break
@@ -58,145 +139,704 @@ def _parse_eczaneleri_net_html(
         if len(list_items) < 2:
             continue
 
-        item = {
-            "name": "",
-            "address": "",
-            "phone": "",
-            "map_link": "",
-            "il_ilce": f"{il_adi} / {ilce_adi}",
-        }
-
+        # Her li bir kez sınıflandırılır: metin + kural tablosuna göre linkler
+        records: list[ListItemFields] = []
         for li in list_items:
-            text = li.get_text(strip=True)
-            # Telefon: tel: içeren link
-            a_tel = li.find("a", href=re.compile(r"^tel:", re.I))
-            if a_tel:
-                item["phone"] = _normalize_phone(a_tel.get_text(strip=True) or a_tel.get("href", ""))
-
-            # Harita: google maps linki
-            a_map = li.find("a", href=re.compile(r"google\.com/maps|maps\.google|maps\?q=", re.I))
-            if a_map and a_map.get("href"):
-                item["map_link"] = (a_map["href"] or "").strip()
-
-            # Eczane adı: eczaneleri.net detay sayfası linki (il.eczaneleri.net/...)
-            a_eczane = li.find("a", href=re.compile(r"eczaneleri\.net", re.I))
-            if a_eczane and a_eczane.get("href") and "iframe" not in (a_eczane.get("href") or ""):
-                name_candidate = a_eczane.get_text(strip=True)
-                if name_candidate and len(name_candidate) > 2:
-                    item["name"] = name_candidate
-
-            # Adres: uzun metin satırı (genelde büyük harf, 20+ karakter, tel/maps linki değil)
-            if len(text) > 20 and not text.startswith("http") and "Tekirdağ" not in text and " - " not in text[:30]:
-                if not li.find("a", href=re.compile(r"^tel:", re.I)) and not li.find("a", href=re.compile(r"maps")):
-                    if len(text) > len(item["address"]):
-                        item["address"] = text
-
-        # Eczane adı bulunamadıysa: ilk anlamlı li metnini (kısa isim) veya son li'yi dene
-        if not item["name"] and list_items:
-            for li in list_items:
-                t = li.get_text(strip=True)
-                if 3 <= len(t) <= 80 and not t.startswith("0") and "Yol Tarifi" not in t and "Ara" != t:
-                    if not re.match(r"^[\d\s\-+]+$", t) and "http" not in t:
-                        item["name"] = t
-                        break
-            if not item["name"] and list_items:
-                item["name"] = list_items[-1].get_text(strip=True) or list_items[0].get_text(strip=True)
-
-        if item["name"]:
+            record = ListItemFields(li.get_text(strip=True))
+            for a in li.find_all("a", href=True):
+                anchor = AnchorRef(a.get("href") or "")
+                if record.classify(anchor):
+                    anchor.parts.append(a.get_text(strip=True))
+            records.append(record)
+
+        item = build_item(records, il_adi, ilce_adi, exclusions)
+        if item.name:
             pharmacies.append(item)
 
     return pharmacies
 
 
-async def fetch_pharmacies_async(
-    session, city: str, district: str = "", limit: int = 5
-) -> list[dict[str, Any]] | None:
+def parse_pharmacies(
+    html: str,
+    limit: int,
+    il_adi: str,
+    ilce_adi: str,
+    engine: str = PARSER_ENGINE_STREAM,
+) -> list[Pharmacy]:
     """
-    Eczaneleri.net iframe URL'sinden veri çeker (aiohttp session ile).
-    session: aiohttp ClientSession (hass.helpers.aiohttp_client.async_get_clientsession)
+    Seçilen parser motoruyla HTML'i parse eder.
+    Streaming motor hata verirse BeautifulSoup motoruna geri düşer.
+    """
+    if engine == PARSER_ENGINE_STREAM:
+        try:
+            return parse_eczaneleri_net_html_stream(html, limit, il_adi, ilce_adi)
+        except Exception as e:
+            _LOGGER.warning("Streaming parser hatası, %s motoruna geçiliyor: %s", PARSER_ENGINE_BS4, e)
+    return _parse_eczaneleri_net_html(html, limit, il_adi, ilce_adi)
+
+
+@dataclass
+class ParseStats:
+    """Parse süreleri: executor'da geçen süre event loop'tan kazanılan süredir."""
+
+    inline_count: int = 0
+    inline_seconds: float = 0.0
+    executor_count: int = 0
+    executor_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+
+# Entegrasyon geneli parse istatistikleri
+PARSE_STATS = ParseStats()
+
+
+@dataclass
+class FetchMetrics:
+    """Bir API nesnesinin fetch/parse sayaçları (diagnostic sensor'lar ve diagnostics için)."""
+
+    fetches: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    # HTTP istekleri (yeniden denemeler dahil) ve başarılı (2xx / 304) yanıtlar
+    requests: int = 0
+    responses: int = 0
+    # 304, aynı gövde özeti veya aynı sonuç: önceki liste nesnesi kullanıldı
+    cache_hits: int = 0
+    parses: int = 0
+    zero_results: int = 0
+    bytes_total: int = 0
+    # Ağdan gelen boyutu bilinen gövdeler: ağdaki bayt ve sıkıştırmayla kazanılan bayt
+    bytes_wire: int = 0
+    bytes_saved: int = 0
+    last_latency_ms: float | None = None
+    last_bytes: int = 0
+    last_parse_ms: float = 0.0
+    last_count: int | None = None
+    last_success: datetime | None = None
+    last_error: str | None = None
+
+    @property
+    def cache_hit_ratio(self) -> float | None:
+        return self.cache_hits / self.responses if self.responses else None
+
+    def begin(self) -> None:
+        self.last_bytes = 0
+        self.last_parse_ms = 0.0
+
+    def record_body(self, size: int, wire: int | None = None) -> None:
+        self.last_bytes += size
+        self.bytes_total += size
+        if wire is not None:
+            self.bytes_wire += wire
+            self.bytes_saved += max(0, size - wire)
+
+    def record_parse(self, seconds: float) -> None:
+        self.parses += 1
+        self.last_parse_ms += seconds * 1000
+
+    def finish(self, result: list[Pharmacy] | None, seconds: float) -> None:
+        self.fetches += 1
+        self.last_latency_ms = seconds * 1000
+        if result is None:
+            self.failures += 1
+            self.consecutive_failures += 1
+            return
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.last_success = datetime.now(timezone.utc)
+        self.last_count = len(result)
+        if not result:
+            self.zero_results += 1
+
+
+def _timed_parse(
+    html: str, limit: int, il_adi: str, ilce_adi: str, engine: str
+) -> tuple[list[Pharmacy], float]:
+    start = time.perf_counter()
+    pharmacies = parse_pharmacies(html, limit, il_adi, ilce_adi, engine)
+    return pharmacies, time.perf_counter() - start
+
+
+async def async_parse_pharmacies(
+    html: str,
+    limit: int,
+    il_adi: str,
+    ilce_adi: str,
+    engine: str = PARSER_ENGINE_STREAM,
+    size: int | None = None,
+    metrics: FetchMetrics | None = None,
+) -> list[Pharmacy]:
+    """
+    HTML'i parse eder: streaming motorla PARSE_INLINE_MAX_BYTES altındaki sayfalar
+    event loop'ta, büyükleri executor'da (event loop'u bloklamadan) işlenir.
+    BeautifulSoup (ilk bs4 import'u dahil) boyuttan bağımsız her zaman executor'da
+    çalışır; inline streaming parse hata verirse de bs4'e executor'da geçilir.
+    """
+    size = len(html) if size is None else size
+    inline = engine == PARSER_ENGINE_STREAM and size < PARSE_INLINE_MAX_BYTES
+    if inline:
+        start = time.perf_counter()
+        try:
+            pharmacies = parse_eczaneleri_net_html_stream(html, limit, il_adi, ilce_adi)
+        except Exception as e:
+            _LOGGER.warning(
+                "Streaming parser hatası, %s motoruna geçiliyor: %s", PARSER_ENGINE_BS4, e
+            )
+            inline = False
+            engine = PARSER_ENGINE_BS4
+        else:
+            elapsed = time.perf_counter() - start
+            PARSE_STATS.inline_count += 1
+            PARSE_STATS.inline_seconds += elapsed
+    if not inline:
+        pharmacies, elapsed = await asyncio.get_running_loop().run_in_executor(
+            None, _timed_parse, html, limit, il_adi, ilce_adi, engine
+        )
+        PARSE_STATS.executor_count += 1
+        PARSE_STATS.executor_seconds += elapsed
+    PARSE_STATS.last_seconds = elapsed
+    if metrics is not None:
+        metrics.record_parse(elapsed)
+    _LOGGER.debug(
+        "Eczaneleri.net parse: %s bayt, %.1f ms (%s)",
+        size,
+        elapsed * 1000,
+        "inline" if inline else "executor",
+    )
+    return pharmacies
+
+
+class StreamedBody(NamedTuple):
+    """Streaming okuma sonucu: eczaneler (boş gövde veya özet eşleştiyse None) ve gövde özeti.
+
+    Gövde sonuna kadar okunmadıysa (erken kesildi) özet None'dır.
     """
+
+    pharmacies: list[Pharmacy] | None
+    digest: bytes | None
+
+
+async def _async_parse_rest(
+    resp,
+    chunks: list[bytes],
+    hasher: Any,
+    known_hash: bytes | None,
+    limit: int,
+    il_adi: str,
+    ilce_adi: str,
+    engine: str,
+    metrics: FetchMetrics | None,
+) -> StreamedBody:
+    """Kalan gövdeyi okuyup tüm sayfayı engine ile baştan parse eder (boyuta göre executor'da).
+
+    Gövde özeti known_hash ile aynıysa parse atlanır.
+    """
+    from aiohttp import ClientError
+    try:
+        rest = await resp.read()
+    except (ClientError, asyncio.TimeoutError):
+        resp.close()
+        raise
+    chunks.append(rest)
+    hasher.update(rest)
+    digest = hasher.digest()
+    raw = b"".join(chunks)
+    if metrics is not None:
+        metrics.record_body(len(raw), _wire_size(resp, len(raw)))
+    if digest == known_hash:
+        return StreamedBody(None, digest)
+    text = raw.decode("utf-8", errors="replace")
+    if not text.strip():
+        return StreamedBody(None, digest)
+    pharmacies = await async_parse_pharmacies(
+        text, limit, il_adi, ilce_adi, engine, len(raw), metrics
+    )
+    return StreamedBody(pharmacies, digest)
+
+
+async def _async_read_streaming(
+    resp,
+    limit: int,
+    il_adi: str,
+    ilce_adi: str,
+    metrics: FetchMetrics | None = None,
+    known_hash: bytes | None = None,
+) -> StreamedBody:
+    """
+    Yanıt gövdesini parça parça okuyup artımlı parser'a verir; istenen sayıda
+    eczane bulununca bağlantı kapatılır ve kalan gövde indirilmez.
+    Gövde boşsa eczaneler None olur. Parser hata verirse tam gövde BeautifulSoup ile işlenir.
+    PARSE_INLINE_MAX_BYTES okunduğu halde parser bitmediyse event loop'u
+    bloklamamak için kalan gövde okunup tamamı executor'da parse edilir; tam
+    okunan gövdenin özeti known_hash ile aynıysa bu parse atlanır.
+    """
+    from aiohttp import ClientError
+    parser = EczaneHTMLParser(limit, il_adi, ilce_adi)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    hasher = _body_hasher()
+    chunks: list[bytes] = []
+    received = 0
+    blank = True
+    # Sadece parser'da geçen süre (ağdan okuma beklemesi hariç)
+    elapsed = 0.0
+    try:
+        async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+            chunks.append(chunk)
+            hasher.update(chunk)
+            received += len(chunk)
+            blank = blank and not chunk.strip()
+            start = time.perf_counter()
+            parser.feed(decoder.decode(chunk))
+            elapsed += time.perf_counter() - start
+            if parser.done:
+                break
+            if received >= PARSE_INLINE_MAX_BYTES:
+                # Büyük sayfa: inline harcanan süre kayıt altında, kalanı executor'da
+                PARSE_STATS.inline_seconds += elapsed
+                _LOGGER.debug(
+                    "Eczaneleri.net streaming: %s bayt sonra executor'a geçiliyor", received
+                )
+                return await _async_parse_rest(
+                    resp,
+                    chunks,
+                    hasher,
+                    known_hash,
+                    limit,
+                    il_adi,
+                    ilce_adi,
+                    PARSER_ENGINE_STREAM,
+                    metrics,
+                )
+        else:
+            start = time.perf_counter()
+            parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+            elapsed += time.perf_counter() - start
+    except (ClientError, asyncio.TimeoutError):
+        # Ağ hatası: bağlantı yeniden kullanılmaz
+        resp.close()
+        raise
+    except Exception as e:
+        _LOGGER.warning("Streaming parser hatası, %s motoruna geçiliyor: %s", PARSER_ENGINE_BS4, e)
+        return await _async_parse_rest(
+            resp, chunks, hasher, None, limit, il_adi, ilce_adi, PARSER_ENGINE_BS4, metrics
+        )
+
+    # Gövde sonuna kadar geldiyse (erken kesilse de) bağlantı havuza döner
+    complete = not parser.done or resp.content.at_eof()
+    if complete:
+        resp.release()
+    else:
+        # Kalan gövdeyi okumamak için bağlantı havuza dönmeden kapatılır
+        resp.close()
+    PARSE_STATS.inline_count += 1
+    PARSE_STATS.inline_seconds += elapsed
+    PARSE_STATS.last_seconds = elapsed
+    if metrics is not None:
+        # Erken kesilen gövdenin ağdaki boyutu bilinmez
+        metrics.record_body(received, _wire_size(resp, received) if complete else None)
+        metrics.record_parse(elapsed)
+    _LOGGER.debug(
+        "Eczaneleri.net streaming: %s bayt okundu, parse %.1f ms%s",
+        received,
+        elapsed * 1000,
+        "" if complete else " (erken kesildi)",
+    )
+    digest = hasher.digest() if complete else None
+    if blank:
+        return StreamedBody(None, digest)
+    return StreamedBody(parser.results(), digest)
+
+
+def _log_result(pharmacies: list[Pharmacy], city: str, district: str) -> None:
+    if pharmacies:
+        _LOGGER.info(
+            "Eczaneleri.net: %s eczane alındı (İl: %s, İlçe: %s)",
+            len(pharmacies),
+            city,
+            district or "Yok",
+        )
+    else:
+        _LOGGER.warning(
+            "Eczaneleri.net: eczane bulunamadı veya parse edilemedi (İl: %s, İlçe: %s)",
+            city,
+            district or "Yok",
+        )
+
+
+@dataclass
+class FetchCache:
+    """Son yanıtın doğrulayıcıları (ETag / Last-Modified / gövde özeti) ve parse sonucu."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    body_hash: bytes | None = None
+    limit: int = 0
+    result: list[Pharmacy] | None = None
+
+    def valid_for(self, limit: int) -> bool:
+        return self.result is not None and self.limit == limit
+
+    def conditional_headers(self, limit: int) -> dict[str, str]:
+        """Sunucu destekliyorsa koşullu istek başlıkları."""
+        if not self.valid_for(limit):
+            return {}
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@lru_cache(maxsize=256)
+def _build_url(template: str, city: str, county: str) -> str:
+    city, county = canonical_location(city, county)
+    return template.format(city=quote(city, safe=""), county=quote(county, safe=""))
+
+
+def request_url(city: str, county: str) -> str:
+    """(il, ilçe) için istek URL'si; kataloğdaki yazımla, konum başına bir kez hesaplanır."""
+    return _build_url(ECZANELERI_NET_URL, city, county)
+
+
+def _body_hasher() -> Any:
+    return hashlib.blake2b(digest_size=16)
+
+
+def _body_hash(raw: bytes) -> bytes:
+    hasher = _body_hasher()
+    hasher.update(raw)
+    return hasher.digest()
+
+
+async def _async_fetch_once(
+    session,
+    city: str,
+    district: str,
+    limit: int,
+    engine: str,
+    cache: FetchCache | None,
+    metrics: FetchMetrics | None = None,
+) -> list[Pharmacy]:
+    """Tek (il, ilçe) isteği; hata durumunda exception fırlatır."""
     city = (city or "").strip()
     district = (district or "").strip()
-    limit = max(1, min(20, limit))
+    limit = max(1, min(ROSTER_FETCH_LIMIT, limit))
     ilce_adi = district if district else city
 
-    url = ECZANELERI_NET_URL.format(
-        city=quote(city, safe=""),
-        county=quote(ilce_adi, safe=""),
-    )
+    url = request_url(city, ilce_adi)
     _LOGGER.debug("Eczaneleri.net isteği: %s", url)
+    if metrics is not None:
+        metrics.requests += 1
 
-    try:
-        from aiohttp import ClientTimeout
-        timeout = ClientTimeout(total=15)
-        resp = await session.get(
-            url,
-            timeout=timeout,
-            headers={"User-Agent": USER_AGENT},
-        )
-        resp.raise_for_status()
-        raw = await resp.read()
-        text = raw.decode("utf-8", errors="replace")
-        if not text.strip():
+    headers = request_headers()
+    if cache is not None:
+        headers.update(cache.conditional_headers(limit))
+    resp = await session.get(
+        url,
+        timeout=request_timeout(),
+        headers=headers,
+    )
+    if resp.status == 304 and cache is not None and cache.valid_for(limit):
+        resp.release()
+        _LOGGER.debug("Eczaneleri.net: sayfa değişmedi (304), önceki sonuç kullanılıyor")
+        if metrics is not None:
+            metrics.responses += 1
+            metrics.cache_hits += 1
+        return cache.result
+    resp.raise_for_status()
+    if metrics is not None:
+        metrics.responses += 1
+    # Tüm liste istendiyse erken durma olmaz: inline önek parse'ı atlanır, sayfa bir kez parse edilir
+    if engine == PARSER_ENGINE_STREAM and limit < ROSTER_FETCH_LIMIT:
+        known_hash = cache.body_hash if cache is not None and cache.valid_for(limit) else None
+        body = await _async_read_streaming(resp, limit, city, ilce_adi, metrics, known_hash)
+        if cache is not None and known_hash is not None and body.digest == known_hash:
+            cache.etag = resp.headers.get("ETag")
+            cache.last_modified = resp.headers.get("Last-Modified")
+            _LOGGER.debug("Eczaneleri.net: içerik aynı (gövde özeti), önceki sonuç kullanılıyor")
+            if metrics is not None:
+                metrics.cache_hits += 1
+            return cache.result
+        pharmacies = body.pharmacies
+        if pharmacies is None:
             _LOGGER.warning("Eczaneleri.net boş yanıt (İl: %s, İlçe: %s)", city, district or "Yok")
             return []
-
-        pharmacies = _parse_eczaneleri_net_html(text, limit, city, ilce_adi)
-        if pharmacies:
-            _LOGGER.info(
-                "Eczaneleri.net: %s eczane alındı (İl: %s, İlçe: %s)",
-                len(pharmacies),
-                city,
-                district or "Yok",
-            )
-        else:
-            _LOGGER.warning(
-                "Eczaneleri.net: eczane bulunamadı veya parse edilemedi (İl: %s, İlçe: %s)",
-                city,
-                district or "Yok",
-            )
+        if cache is not None:
+            cache.etag = resp.headers.get("ETag")
+            cache.last_modified = resp.headers.get("Last-Modified")
+            # Erken kesilen gövdenin özeti yok: sonuç karşılaştırılır
+            if cache.valid_for(limit) and cache.result == pharmacies:
+                _LOGGER.debug("Eczaneleri.net: içerik aynı, önceki sonuç kullanılıyor")
+                if metrics is not None:
+                    metrics.cache_hits += 1
+                cache.body_hash = body.digest
+                return cache.result
+            cache.body_hash = body.digest
+            cache.limit = limit
+            cache.result = pharmacies
+        _log_result(pharmacies, city, district)
         return pharmacies
+
+    raw = await resp.read()
+    if metrics is not None:
+        metrics.record_body(len(raw), _wire_size(resp, len(raw)))
+    digest = _body_hash(raw)
+    if cache is not None:
+        cache.etag = resp.headers.get("ETag")
+        cache.last_modified = resp.headers.get("Last-Modified")
+        if cache.valid_for(limit) and cache.body_hash == digest:
+            _LOGGER.debug("Eczaneleri.net: içerik aynı, parse atlandı")
+            if metrics is not None:
+                metrics.cache_hits += 1
+            return cache.result
+    text = raw.decode("utf-8", errors="replace")
+    if not text.strip():
+        _LOGGER.warning("Eczaneleri.net boş yanıt (İl: %s, İlçe: %s)", city, district or "Yok")
+        return []
+
+    pharmacies = await async_parse_pharmacies(
+        text, limit, city, ilce_adi, engine, len(raw), metrics
+    )
+    _log_result(pharmacies, city, district)
+    if cache is not None:
+        cache.body_hash = digest
+        cache.limit = limit
+        cache.result = pharmacies
+    return pharmacies
+
+
+async def _async_fetch_resilient(
+    session,
+    city: str,
+    district: str,
+    limit: int,
+    engine: str,
+    cache: FetchCache | None,
+    metrics: FetchMetrics | None = None,
+) -> list[Pharmacy]:
+    """_async_fetch_once'ı sunucu devre kesicisi, istek sınırı ve geçici hatalarda yeniden deneme ile çağırır."""
+    host = urlsplit(ECZANELERI_NET_URL).hostname or ""
+    return await async_call_with_retry(
+        lambda: _async_fetch_once(session, city, district, limit, engine, cache, metrics),
+        get_breaker(host),
+        limiter=get_rate_limiter(host),
+    )
+
+
+class EczaneleriNetProvider(Provider):
+    """eczaneleri.net new-iframe sayfası (devre kesici ve yeniden deneme ile)."""
+
+    name = "eczaneleri_net"
+
+    async def async_fetch(
+        self,
+        session,
+        city: str,
+        district: str,
+        limit: int,
+        engine: str,
+        cache: FetchCache | None,
+        metrics: FetchMetrics | None,
+    ) -> list[Pharmacy]:
+        return await _async_fetch_resilient(session, city, district, limit, engine, cache, metrics)
+
+
+register_provider(EczaneleriNetProvider())
+
+
+def _log_fetch_error(err: Exception, metrics: FetchMetrics | None) -> None:
+    if isinstance(err, CircuitOpenError):
+        _LOGGER.warning("Eczaneleri.net isteği atlandı: %s", err)
+    else:
+        _LOGGER.error("Eczaneleri.net hatası: %s", err, exc_info=err)
+    if metrics is not None:
+        metrics.last_error = str(err) or type(err).__name__
+
+
+async def fetch_pharmacies_async(
+    session,
+    city: str,
+    district: str = "",
+    limit: int = 5,
+    engine: str = PARSER_ENGINE_STREAM,
+    cache: FetchCache | None = None,
+    metrics: FetchMetrics | None = None,
+) -> list[Pharmacy] | None:
+    """
+    Eczaneleri.net iframe URL'sinden veri çeker (aiohttp session ile).
+    session: aiohttp ClientSession (hass.helpers.aiohttp_client.async_get_clientsession)
+    cache verilirse koşullu istek yapılır; sayfa değişmediyse (304 veya aynı gövde)
+    parse atlanır ve önceki sonuç (aynı liste nesnesi) döner.
+    """
+    try:
+        return await _async_fetch_resilient(
+            session, city, district, limit, engine, cache, metrics
+        )
     except Exception as e:
-        _LOGGER.error("Eczaneleri.net hatası: %s", e, exc_info=True)
+        _log_fetch_error(e, metrics)
         return None
 
 
+@dataclass
+class FetchManyResult:
+    """fetch_many sonucu: konum başına eczane listesi veya hata."""
+
+    results: dict[tuple[str, str], list[Pharmacy]] = field(default_factory=dict)
+    errors: dict[tuple[str, str], Exception] = field(default_factory=dict)
+
+
+async def fetch_many(
+    session,
+    locations: Iterable[tuple[str, str]],
+    limit: int = 5,
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+    engine: str = PARSER_ENGINE_STREAM,
+    caches: dict[tuple[str, str], FetchCache] | None = None,
+    metrics: FetchMetrics | None = None,
+    fetch_location: Callable[[str, str], Awaitable[list[Pharmacy]]] | None = None,
+) -> FetchManyResult:
+    """
+    Birden fazla (il, ilçe) için aynı session üzerinden en fazla `concurrency`
+    eşzamanlı istek yapar; büyük sayfalar event loop dışında (executor) parse edilir.
+    caches verilirse konum başına koşullu istek önbelleği tutulur. fetch_location
+    verilirse her konum onunla çekilir (örn. sağlayıcılar üzerinden; caches kullanılmaz).
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    outcome = FetchManyResult()
+
+    async def _fetch(location: tuple[str, str]) -> None:
+        city, district = location
+        cache = caches.setdefault(location, FetchCache()) if caches is not None else None
+        async with semaphore:
+            try:
+                if fetch_location is not None:
+                    outcome.results[location] = await fetch_location(city, district)
+                else:
+                    outcome.results[location] = await _async_fetch_resilient(
+                        session, city, district, limit, engine, cache, metrics
+                    )
+            except Exception as err:
+                outcome.errors[location] = err
+
+    await asyncio.gather(*(_fetch(location) for location in dict.fromkeys(locations)))
+    return outcome
+
+
 class HasWaveEczaneAPI:
-    """Eczaneleri.net iframe'den nöbetçi eczane verisi (async veya sync wrapper)."""
+    """Kayıtlı sağlayıcılardan nöbetçi eczane verisi (async)."""
 
-    def __init__(self, city: str, district: str = "", limit: int = 5) -> None:
+    def __init__(
+        self,
+        city: str,
+        district: str = "",
+        limit: int = 5,
+        parser_engine: str = PARSER_ENGINE_STREAM,
+        concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+        providers: Sequence[Provider] | None = None,
+    ) -> None:
         self.city = (city or "").strip()
         self.district = (district or "").strip()
-        self.limit = max(1, min(20, limit))
+        # Virgülle ayrılmış birden fazla ilçe: il geneli (çok ilçeli) mod
+        self.districts = split_districts(self.district)
+        self.limit = max(1, min(ROSTER_FETCH_LIMIT, limit))
+        self.parser_engine = parser_engine
+        self.concurrency = concurrency
+        self.providers = list(providers) if providers else get_providers()
+        # (sağlayıcı, il, ilçe) -> koşullu istek önbelleği
+        self.caches: dict[tuple[str, str, str], FetchCache] = {}
+        self._combined: list[Pharmacy] | None = None
+        self._combined_parts: dict[tuple[str, str], list[Pharmacy]] = {}
+        self.metrics = FetchMetrics()
 
-    async def async_fetch(self, session) -> list[dict[str, Any]] | None:
-        """Async: aiohttp session ile veri çek."""
-        return await fetch_pharmacies_async(
-            session, self.city, self.district, self.limit
-        )
+    @property
+    def multi_district(self) -> bool:
+        return len(self.districts) > 1
 
-    def fetch_pharmacies(self) -> list[dict[str, Any]] | None:
-        """Sync: requests ile (config flow / executor için)."""
-        try:
-            import requests
-            ilce_adi = self.district if self.district else self.city
-            url = ECZANELERI_NET_URL.format(
-                city=quote(self.city, safe=""),
-                county=quote(ilce_adi, safe=""),
-            )
-            response = requests.get(
-                url,
-                timeout=15,
-                headers={"User-Agent": USER_AGENT},
+    async def async_fetch(self, session) -> list[Pharmacy] | None:
+        """Async: aiohttp session ile veri çek (değişmeyen sayfada önceki liste nesnesi döner)."""
+        self.metrics.begin()
+        start = time.perf_counter()
+        if self.multi_district:
+            result = await self._async_fetch_districts(session)
+        else:
+            try:
+                result = await self._async_fetch_location(
+                    session, self.city, self.districts[0] if self.districts else ""
+                )
+            except Exception as e:
+                _log_fetch_error(e, self.metrics)
+                result = None
+        self.metrics.finish(result, time.perf_counter() - start)
+        return result
+
+    async def async_probe(self, session) -> list[Pharmacy]:
+        """Config flow doğrulaması: konum başına tek deneme, toplamda HTTP_TOTAL_TIMEOUT.
+
+        Yeniden deneme, devre kesici ve istek sınırı kullanılmaz (form uzun süre
+        beklemesin, doğrulama hataları kesiciyi açmasın); hata fırlatır.
+        """
+        locations = [(self.city, district) for district in self.districts or [""]]
+        async with asyncio.timeout(HTTP_TOTAL_TIMEOUT):
+            outcome = await fetch_many(
+                session,
+                locations,
+                self.limit,
+                self.concurrency,
+                self.parser_engine,
+                fetch_location=lambda city, district: _async_fetch_once(
+                    session, city, district, self.limit, self.parser_engine, None
+                ),
             )
-            response.raise_for_status()
-            response.encoding = "utf-8"
-            text = response.text
-            if not text.strip():
-                return []
-            return _parse_eczaneleri_net_html(
-                text, self.limit, self.city, ilce_adi
+        for location in locations:
+            if location in outcome.errors:
+                raise outcome.errors[location]
+        return [pharmacy for location in locations for pharmacy in outcome.results[location]]
+
+    async def _async_fetch_location(self, session, city: str, district: str) -> list[Pharmacy]:
+        """Tek (il, ilçe): sağlayıcılar gecikme sırasıyla, hedge'li denenir; hata fırlatır."""
+
+        def _fetch(provider: Provider) -> Awaitable[list[Pharmacy]]:
+            cache = self.caches.setdefault((provider.name, city, district), FetchCache())
+            return provider.async_fetch(
+                session, city, district, self.limit, self.parser_engine, cache, self.metrics
             )
-        except Exception as e:
-            _LOGGER.error("Eczaneleri.net (sync) hatası: %s", e, exc_info=True)
+
+        return await async_fetch_hedged(self.providers, _fetch)
+
+    async def _async_fetch_districts(self, session) -> list[Pharmacy] | None:
+        """Tüm ilçeleri fetch_many ile çek; ilçe sırasına göre tek listede birleştir."""
+        locations = [(self.city, district) for district in self.districts]
+        outcome = await fetch_many(
+            session,
+            locations,
+            self.limit,
+            self.concurrency,
+            self.parser_engine,
+            metrics=self.metrics,
+            fetch_location=lambda city, district: self._async_fetch_location(
+                session, city, district
+            ),
+        )
+        for (city, district), err in outcome.errors.items():
+            _LOGGER.warning("Eczaneleri.net hatası (İl: %s, İlçe: %s): %s", city, district, err)
+            self.metrics.last_error = f"{district}: {err}"
+        if not outcome.results:
             return None
+
+        previous = self._combined_parts
+        parts: dict[tuple[str, str], list[Pharmacy]] = {}
+        for location in locations:
+            part = outcome.results.get(location)
+            if part is None:
+                # Bu ilçe alınamadı: varsa son başarılı sonucu kullan
+                part = previous.get(location, [])
+            parts[location] = part
+        if self._combined is not None and list(parts) == list(previous) and all(
+            part is previous[location] for location, part in parts.items()
+        ):
+            return self._combined
+        self._combined_parts = parts
+        self._combined = [pharmacy for part in parts.values() for pharmacy in part]
+        return self._combined
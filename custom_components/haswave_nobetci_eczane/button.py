@@ -7,9 +7,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .coordinator import EczaneDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Buton platformu kurulumu."""
-    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    coordinator: EczaneDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     device_info = DeviceInfo(
         identifiers={(DOMAIN, entry.entry_id)},
         name=entry.title or "Nöbetçi Eczane",
@@ -37,7 +38,7 @@ class NobetciEczaneGuncelleButton(CoordinatorEntity, ButtonEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EczaneDataUpdateCoordinator,
         entry_id: str,
         device_info: DeviceInfo,
     ) -> None:
@@ -46,5 +47,5 @@ class NobetciEczaneGuncelleButton(CoordinatorEntity, ButtonEntity):
         self._attr_device_info = device_info
 
     async def async_press(self) -> None:
-        """Butona basıldığında veriyi yenile."""
-        await self.coordinator.async_request_refresh()
+        """Butona basıldığında veriyi yenile (devam eden fetch'e katılır, yeni veride istek yapılmaz)."""
+        await self.coordinator.async_manual_refresh()
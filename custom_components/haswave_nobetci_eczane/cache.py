@@ -0,0 +1,142 @@
+"""Son başarılı eczane listesinin (il, ilçe) bazında diske kaydı (hızlı açılış için)."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_PROBE_CACHE, DATA_ROSTER_CACHE, DOMAIN
+from .models import Pharmacy
+from .util import location_key
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.roster_cache"
+# Art arda gelen güncellemeler tek yazıma toplanır (saniye)
+SAVE_DELAY = 10
+# Config flow doğrulamasında alınan listenin ilk güncellemede kullanılabileceği süre (saniye)
+PROBE_TTL = 120
+
+
+def cache_key(key: tuple[str, str]) -> str:
+    """location_key() çiftini JSON anahtarına çevirir."""
+    return "|".join(key)
+
+
+class RosterCache:
+    """Koordinatörlerin paylaştığı, HA Store ile saklanan son liste önbelleği."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._data: dict[str, dict[str, Any]] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Önbelleği bir kez yükle (eşzamanlı entry kurulumlarında tek okuma)."""
+        async with self._lock:
+            if self._loaded:
+                return
+            try:
+                stored = await self._store.async_load()
+            except Exception as err:
+                _LOGGER.warning("Eczane önbelleği okunamadı: %s", err)
+                stored = None
+            self._data = (stored or {}).get("locations", {})
+            self._loaded = True
+
+    def get(self, key: tuple[str, str]) -> tuple[list[Pharmacy], datetime] | None:
+        """(eczaneler, kayıt zamanı) veya None."""
+        entry = self._data.get(cache_key(key))
+        if not entry:
+            return None
+        updated = dt_util.parse_datetime(entry.get("updated") or "")
+        pharmacies = entry.get("pharmacies")
+        if updated is None or not isinstance(pharmacies, list):
+            return None
+        return [Pharmacy.from_dict(item) for item in pharmacies if isinstance(item, dict)], updated
+
+    @callback
+    def async_set(self, key: tuple[str, str], limit: int, pharmacies: list[Pharmacy]) -> None:
+        """Başarılı listeyi kaydet (gecikmeli yazım)."""
+        self._data[cache_key(key)] = {
+            "updated": dt_util.utcnow().isoformat(),
+            "limit": limit,
+            "pharmacies": [pharmacy.as_dict() for pharmacy in pharmacies],
+        }
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, key: tuple[str, str]) -> None:
+        """Artık hiçbir entry'nin kullanmadığı konumun kaydını sil."""
+        if self._data.pop(cache_key(key), None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_retain(self, keys: set[tuple[str, str]]) -> None:
+        """keys dışındaki konumların kayıtlarını sil (silinmiş entry'lerden kalanlar)."""
+        wanted = {cache_key(key) for key in keys}
+        removed = [name for name in self._data if name not in wanted]
+        for name in removed:
+            del self._data[name]
+        if removed:
+            _LOGGER.debug("Eczane önbelleği: %s kullanılmayan konum silindi", len(removed))
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"locations": self._data}
+
+
+async def async_get_roster_cache(hass: HomeAssistant) -> RosterCache:
+    """Entegrasyon genelindeki önbelleği döndür (ilk çağrıda diskten yüklenir)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache: RosterCache | None = domain_data.get(DATA_ROSTER_CACHE)
+    if cache is None:
+        cache = domain_data[DATA_ROSTER_CACHE] = RosterCache(hass)
+        await cache.async_load()
+        # Önceki sürümlerde silinen entry'lerin kayıtları da temizlensin
+        cache.async_retain(
+            {
+                location_key(entry.data.get("city", ""), entry.data.get("district", ""))
+                for entry in hass.config_entries.async_entries(DOMAIN)
+            }
+        )
+    else:
+        await cache.async_load()
+    return cache
+
+
+@callback
+def async_store_probe(
+    hass: HomeAssistant, key: tuple[str, str], limit: int, pharmacies: list[Pharmacy]
+) -> None:
+    """Config flow doğrulama sonucunu kısa süreliğine sakla."""
+    probes: dict[tuple[str, str], tuple[float, int, list[Pharmacy]]] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(DATA_PROBE_CACHE, {})
+    now = time.monotonic()
+    for stale_key in [k for k, (stored, _, _) in probes.items() if now - stored > PROBE_TTL]:
+        probes.pop(stale_key)
+    probes[key] = (now, limit, pharmacies)
+
+
+@callback
+def async_pop_probe(
+    hass: HomeAssistant, key: tuple[str, str], limit: int
+) -> list[Pharmacy] | None:
+    """Süresi dolmamış ve en az `limit` eczane için alınmış doğrulama sonucunu (bir kez) al."""
+    probes = hass.data.get(DOMAIN, {}).get(DATA_PROBE_CACHE)
+    if not probes or key not in probes:
+        return None
+    stored, probe_limit, pharmacies = probes.pop(key)
+    if time.monotonic() - stored > PROBE_TTL or probe_limit < limit:
+        return None
+    return pharmacies
@@ -0,0 +1,172 @@
+"""Türkiye il/ilçe kataloğu ve Türkçe duyarlı eşleştirme (Home Assistant bağımlılığı yok).
+
+Config flow il/ilçe girişini ağa gitmeden doğrular ve yazım hatalarına öneri
+sunar; api istek URL'sinde kataloğdaki yazımı (büyük harf) kullanır.
+Büyükşehir olmayan illerde merkez ilçe MERKEZ olarak geçer.
+"""
+from __future__ import annotations
+
+import difflib
+from functools import lru_cache
+
+from .util import tr_casefold
+
+# İl:ilçe,ilçe,... (plaka sırasıyla)
+_CATALOG = """\
+ADANA:ALADAĞ,CEYHAN,ÇUKUROVA,FEKE,İMAMOĞLU,KARAİSALI,KARATAŞ,KOZAN,POZANTI,SAİMBEYLİ,SARIÇAM,SEYHAN,TUFANBEYLİ,YUMURTALIK,YÜREĞİR
+ADIYAMAN:MERKEZ,BESNİ,ÇELİKHAN,GERGER,GÖLBAŞI,KAHTA,SAMSAT,SİNCİK,TUT
+AFYONKARAHİSAR:MERKEZ,BAŞMAKÇI,BAYAT,BOLVADİN,ÇAY,ÇOBANLAR,DAZKIRI,DİNAR,EMİRDAĞ,EVCİLER,HOCALAR,İHSANİYE,İSCEHİSAR,KIZILÖREN,SANDIKLI,SİNANPAŞA,SULTANDAĞI,ŞUHUT
+AĞRI:MERKEZ,DİYADİN,DOĞUBAYAZIT,ELEŞKİRT,HAMUR,PATNOS,TAŞLIÇAY,TUTAK
+AMASYA:MERKEZ,GÖYNÜCEK,GÜMÜŞHACIKÖY,HAMAMÖZÜ,MERZİFON,SULUOVA,TAŞOVA
+ANKARA:AKYURT,ALTINDAĞ,AYAŞ,BALA,BEYPAZARI,ÇAMLIDERE,ÇANKAYA,ÇUBUK,ELMADAĞ,ETİMESGUT,EVREN,GÖLBAŞI,GÜDÜL,HAYMANA,KAHRAMANKAZAN,KALECİK,KEÇİÖREN,KIZILCAHAMAM,MAMAK,NALLIHAN,POLATLI,PURSAKLAR,SİNCAN,ŞEREFLİKOÇHİSAR,YENİMAHALLE
+ANTALYA:AKSEKİ,AKSU,ALANYA,DEMRE,DÖŞEMEALTI,ELMALI,FİNİKE,GAZİPAŞA,GÜNDOĞMUŞ,İBRADI,KAŞ,KEMER,KEPEZ,KONYAALTI,KORKUTELİ,KUMLUCA,MANAVGAT,MURATPAŞA,SERİK
+ARTVİN:MERKEZ,ARDANUÇ,ARHAVİ,BORÇKA,HOPA,KEMALPAŞA,MURGUL,ŞAVŞAT,YUSUFELİ
+AYDIN:BOZDOĞAN,BUHARKENT,ÇİNE,DİDİM,EFELER,GERMENCİK,İNCİRLİOVA,KARACASU,KARPUZLU,KOÇARLI,KÖŞK,KUŞADASI,KUYUCAK,NAZİLLİ,SÖKE,SULTANHİSAR,YENİPAZAR
+BALIKESİR:ALTIEYLÜL,AYVALIK,BALYA,BANDIRMA,BİGADİÇ,BURHANİYE,DURSUNBEY,EDREMİT,ERDEK,GÖMEÇ,GÖNEN,HAVRAN,İVRİNDİ,KARESİ,KEPSUT,MANYAS,MARMARA,SAVAŞTEPE,SINDIRGI,SUSURLUK
+BİLECİK:MERKEZ,BOZÜYÜK,GÖLPAZARI,İNHİSAR,OSMANELİ,PAZARYERİ,SÖĞÜT,YENİPAZAR
+BİNGÖL:MERKEZ,ADAKLI,GENÇ,KARLIOVA,KİĞI,SOLHAN,YAYLADERE,YEDİSU
+BİTLİS:MERKEZ,ADİLCEVAZ,AHLAT,GÜROYMAK,HİZAN,MUTKİ,TATVAN
+BOLU:MERKEZ,DÖRTDİVAN,GEREDE,GÖYNÜK,KIBRISCIK,MENGEN,MUDURNU,SEBEN,YENİÇAĞA
+BURDUR:MERKEZ,AĞLASUN,ALTINYAYLA,BUCAK,ÇAVDIR,ÇELTİKÇİ,GÖLHİSAR,KARAMANLI,KEMER,TEFENNİ,YEŞİLOVA
+BURSA:BÜYÜKORHAN,GEMLİK,GÜRSU,HARMANCIK,İNEGÖL,İZNİK,KARACABEY,KELES,KESTEL,MUDANYA,MUSTAFAKEMALPAŞA,NİLÜFER,ORHANELİ,ORHANGAZİ,OSMANGAZİ,YENİŞEHİR,YILDIRIM
+ÇANAKKALE:MERKEZ,AYVACIK,BAYRAMİÇ,BİGA,BOZCAADA,ÇAN,ECEABAT,EZİNE,GELİBOLU,GÖKÇEADA,LAPSEKİ,YENİCE
+ÇANKIRI:MERKEZ,ATKARACALAR,BAYRAMÖREN,ÇERKEŞ,ELDİVAN,ILGAZ,KIZILIRMAK,KORGUN,KURŞUNLU,ORTA,ŞABANÖZÜ,YAPRAKLI
+ÇORUM:MERKEZ,ALACA,BAYAT,BOĞAZKALE,DODURGA,İSKİLİP,KARGI,LAÇİN,MECİTÖZÜ,OĞUZLAR,ORTAKÖY,OSMANCIK,SUNGURLU,UĞURLUDAĞ
+DENİZLİ:ACIPAYAM,BABADAĞ,BAKLAN,BEKİLLİ,BEYAĞAÇ,BOZKURT,BULDAN,ÇAL,ÇAMELİ,ÇARDAK,ÇİVRİL,GÜNEY,HONAZ,KALE,MERKEZEFENDİ,PAMUKKALE,SARAYKÖY,SERİNHİSAR,TAVAS
+DİYARBAKIR:BAĞLAR,BİSMİL,ÇERMİK,ÇINAR,ÇÜNGÜŞ,DİCLE,EĞİL,ERGANİ,HANİ,HAZRO,KAYAPINAR,KOCAKÖY,KULP,LİCE,SİLVAN,SUR,YENİŞEHİR
+EDİRNE:MERKEZ,ENEZ,HAVSA,İPSALA,KEŞAN,LALAPAŞA,MERİÇ,SÜLOĞLU,UZUNKÖPRÜ
+ELAZIĞ:MERKEZ,AĞIN,ALACAKAYA,ARICAK,BASKİL,KARAKOÇAN,KEBAN,KOVANCILAR,MADEN,PALU,SİVRİCE
+ERZİNCAN:MERKEZ,ÇAYIRLI,İLİÇ,KEMAH,KEMALİYE,OTLUKBELİ,REFAHİYE,TERCAN,ÜZÜMLÜ
+ERZURUM:AŞKALE,AZİZİYE,ÇAT,HINIS,HORASAN,İSPİR,KARAÇOBAN,KARAYAZI,KÖPRÜKÖY,NARMAN,OLTU,OLUR,PALANDÖKEN,PASİNLER,PAZARYOLU,ŞENKAYA,TEKMAN,TORTUM,UZUNDERE,YAKUTİYE
+ESKİŞEHİR:ALPU,BEYLİKOVA,ÇİFTELER,GÜNYÜZÜ,HAN,İNÖNÜ,MAHMUDİYE,MİHALGAZİ,MİHALIÇÇIK,ODUNPAZARI,SARICAKAYA,SEYİTGAZİ,SİVRİHİSAR,TEPEBAŞI
+GAZİANTEP:ARABAN,İSLAHİYE,KARKAMIŞ,NİZİP,NURDAĞI,OĞUZELİ,ŞAHİNBEY,ŞEHİTKAMİL,YAVUZELİ
+GİRESUN:MERKEZ,ALUCRA,BULANCAK,ÇAMOLUK,ÇANAKÇI,DERELİ,DOĞANKENT,ESPİYE,EYNESİL,GÖRELE,GÜCE,KEŞAP,PİRAZİZ,ŞEBİNKARAHİSAR,TİREBOLU,YAĞLIDERE
+GÜMÜŞHANE:MERKEZ,KELKİT,KÖSE,KÜRTÜN,ŞİRAN,TORUL
+HAKKARİ:MERKEZ,ÇUKURCA,DERECİK,ŞEMDİNLİ,YÜKSEKOVA
+HATAY:ALTINÖZÜ,ANTAKYA,ARSUZ,BELEN,DEFNE,DÖRTYOL,ERZİN,HASSA,İSKENDERUN,KIRIKHAN,KUMLU,PAYAS,REYHANLI,SAMANDAĞ,YAYLADAĞI
+ISPARTA:MERKEZ,AKSU,ATABEY,EĞİRDİR,GELENDOST,GÖNEN,KEÇİBORLU,SENİRKENT,SÜTÇÜLER,ŞARKİKARAAĞAÇ,ULUBORLU,YALVAÇ,YENİŞARBADEMLİ
+MERSİN:AKDENİZ,ANAMUR,AYDINCIK,BOZYAZI,ÇAMLIYAYLA,ERDEMLİ,GÜLNAR,MEZİTLİ,MUT,SİLİFKE,TARSUS,TOROSLAR,YENİŞEHİR
+İSTANBUL:ADALAR,ARNAVUTKÖY,ATAŞEHİR,AVCILAR,BAĞCILAR,BAHÇELİEVLER,BAKIRKÖY,BAŞAKŞEHİR,BAYRAMPAŞA,BEŞİKTAŞ,BEYKOZ,BEYLİKDÜZÜ,BEYOĞLU,BÜYÜKÇEKMECE,ÇATALCA,ÇEKMEKÖY,ESENLER,ESENYURT,EYÜPSULTAN,FATİH,GAZİOSMANPAŞA,GÜNGÖREN,KADIKÖY,KAĞITHANE,KARTAL,KÜÇÜKÇEKMECE,MALTEPE,PENDİK,SANCAKTEPE,SARIYER,SİLİVRİ,SULTANBEYLİ,SULTANGAZİ,ŞİLE,ŞİŞLİ,TUZLA,ÜMRANİYE,ÜSKÜDAR,ZEYTİNBURNU
+İZMİR:ALİAĞA,BALÇOVA,BAYINDIR,BAYRAKLI,BERGAMA,BEYDAĞ,BORNOVA,BUCA,ÇEŞME,ÇİĞLİ,DİKİLİ,FOÇA,GAZİEMİR,GÜZELBAHÇE,KARABAĞLAR,KARABURUN,KARŞIYAKA,KEMALPAŞA,KINIK,KİRAZ,KONAK,MENDERES,MENEMEN,NARLIDERE,ÖDEMİŞ,SEFERİHİSAR,SELÇUK,TİRE,TORBALI,URLA
+KARS:MERKEZ,AKYAKA,ARPAÇAY,DİGOR,KAĞIZMAN,SARIKAMIŞ,SELİM,SUSUZ
+KASTAMONU:MERKEZ,ABANA,AĞLI,ARAÇ,AZDAVAY,BOZKURT,CİDE,ÇATALZEYTİN,DADAY,DEVREKANİ,DOĞANYURT,HANÖNÜ,İHSANGAZİ,İNEBOLU,KÜRE,PINARBAŞI,SEYDİLER,ŞENPAZAR,TAŞKÖPRÜ,TOSYA
+KAYSERİ:AKKIŞLA,BÜNYAN,DEVELİ,FELAHİYE,HACILAR,İNCESU,KOCASİNAN,MELİKGAZİ,ÖZVATAN,PINARBAŞI,SARIOĞLAN,SARIZ,TALAS,TOMARZA,YAHYALI,YEŞİLHİSAR
+KIRKLARELİ:MERKEZ,BABAESKİ,DEMİRKÖY,KOFÇAZ,LÜLEBURGAZ,PEHLİVANKÖY,PINARHİSAR,VİZE
+KIRŞEHİR:MERKEZ,AKÇAKENT,AKPINAR,BOZTEPE,ÇİÇEKDAĞI,KAMAN,MUCUR
+KOCAELİ:BAŞİSKELE,ÇAYIROVA,DARICA,DERİNCE,DİLOVASI,GEBZE,GÖLCÜK,İZMİT,KANDIRA,KARAMÜRSEL,KARTEPE,KÖRFEZ
+KONYA:AHIRLI,AKÖREN,AKŞEHİR,ALTINEKİN,BEYŞEHİR,BOZKIR,CİHANBEYLİ,ÇELTİK,ÇUMRA,DERBENT,DEREBUCAK,DOĞANHİSAR,EMİRGAZİ,EREĞLİ,GÜNEYSINIR,HADİM,HALKAPINAR,HÜYÜK,ILGIN,KADINHANI,KARAPINAR,KARATAY,KULU,MERAM,SARAYÖNÜ,SELÇUKLU,SEYDİŞEHİR,TAŞKENT,TUZLUKÇU,YALIHÜYÜK,YUNAK
+KÜTAHYA:MERKEZ,ALTINTAŞ,ASLANAPA,ÇAVDARHİSAR,DOMANİÇ,DUMLUPINAR,EMET,GEDİZ,HİSARCIK,PAZARLAR,SİMAV,ŞAPHANE,TAVŞANLI
+MALATYA:AKÇADAĞ,ARAPGİR,ARGUVAN,BATTALGAZİ,DARENDE,DOĞANŞEHİR,DOĞANYOL,HEKİMHAN,KALE,KULUNCAK,PÜTÜRGE,YAZIHAN,YEŞİLYURT
+MANİSA:AHMETLİ,AKHİSAR,ALAŞEHİR,DEMİRCİ,GÖLMARMARA,GÖRDES,KIRKAĞAÇ,KÖPRÜBAŞI,KULA,SALİHLİ,SARIGÖL,SARUHANLI,SELENDİ,SOMA,ŞEHZADELER,TURGUTLU,YUNUSEMRE
+KAHRAMANMARAŞ:AFŞİN,ANDIRIN,ÇAĞLAYANCERİT,DULKADİROĞLU,EKİNÖZÜ,ELBİSTAN,GÖKSUN,NURHAK,ONİKİŞUBAT,PAZARCIK,TÜRKOĞLU
+MARDİN:ARTUKLU,DARGEÇİT,DERİK,KIZILTEPE,MAZIDAĞI,MİDYAT,NUSAYBİN,ÖMERLİ,SAVUR,YEŞİLLİ
+MUĞLA:BODRUM,DALAMAN,DATÇA,FETHİYE,KAVAKLIDERE,KÖYCEĞİZ,MARMARİS,MENTEŞE,MİLAS,ORTACA,SEYDİKEMER,ULA,YATAĞAN
+MUŞ:MERKEZ,BULANIK,HASKÖY,KORKUT,MALAZGİRT,VARTO
+NEVŞEHİR:MERKEZ,ACIGÖL,AVANOS,DERİNKUYU,GÜLŞEHİR,HACIBEKTAŞ,KOZAKLI,ÜRGÜP
+NİĞDE:MERKEZ,ALTUNHİSAR,BOR,ÇAMARDI,ÇİFTLİK,ULUKIŞLA
+ORDU:AKKUŞ,ALTINORDU,AYBASTI,ÇAMAŞ,ÇATALPINAR,ÇAYBAŞI,FATSA,GÖLKÖY,GÜLYALI,GÜRGENTEPE,İKİZCE,KABADÜZ,KABATAŞ,KORGAN,KUMRU,MESUDİYE,PERŞEMBE,ULUBEY,ÜNYE
+RİZE:MERKEZ,ARDEŞEN,ÇAMLIHEMŞİN,ÇAYELİ,DEREPAZARI,FINDIKLI,GÜNEYSU,HEMŞİN,İKİZDERE,İYİDERE,KALKANDERE,PAZAR
+SAKARYA:ADAPAZARI,AKYAZI,ARİFİYE,ERENLER,FERİZLİ,GEYVE,HENDEK,KARAPÜRÇEK,KARASU,KAYNARCA,KOCAALİ,PAMUKOVA,SAPANCA,SERDİVAN,SÖĞÜTLÜ,TARAKLI
+SAMSUN:ALAÇAM,ASARCIK,ATAKUM,AYVACIK,BAFRA,CANİK,ÇARŞAMBA,HAVZA,İLKADIM,KAVAK,LADİK,ONDOKUZMAYIS,SALIPAZARI,TEKKEKÖY,TERME,VEZİRKÖPRÜ,YAKAKENT
+SİİRT:MERKEZ,BAYKAN,ERUH,KURTALAN,PERVARİ,ŞİRVAN,TİLLO
+SİNOP:MERKEZ,AYANCIK,BOYABAT,DİKMEN,DURAĞAN,ERFELEK,GERZE,SARAYDÜZÜ,TÜRKELİ
+SİVAS:MERKEZ,AKINCILAR,ALTINYAYLA,DİVRİĞİ,DOĞANŞAR,GEMEREK,GÖLOVA,GÜRÜN,HAFİK,İMRANLI,KANGAL,KOYULHİSAR,SUŞEHRİ,ŞARKIŞLA,ULAŞ,YILDIZELİ,ZARA
+TEKİRDAĞ:ÇERKEZKÖY,ÇORLU,ERGENE,HAYRABOLU,KAPAKLI,MALKARA,MARMARAEREĞLİSİ,MURATLI,SARAY,SÜLEYMANPAŞA,ŞARKÖY
+TOKAT:MERKEZ,ALMUS,ARTOVA,BAŞÇİFTLİK,ERBAA,NİKSAR,PAZAR,REŞADİYE,SULUSARAY,TURHAL,YEŞİLYURT,ZİLE
+TRABZON:AKÇAABAT,ARAKLI,ARSİN,BEŞİKDÜZÜ,ÇARŞIBAŞI,ÇAYKARA,DERNEKPAZARI,DÜZKÖY,HAYRAT,KÖPRÜBAŞI,MAÇKA,OF,ORTAHİSAR,SÜRMENE,ŞALPAZARI,TONYA,VAKFIKEBİR,YOMRA
+TUNCELİ:MERKEZ,ÇEMİŞGEZEK,HOZAT,MAZGİRT,NAZIMİYE,OVACIK,PERTEK,PÜLÜMÜR
+ŞANLIURFA:AKÇAKALE,BİRECİK,BOZOVA,CEYLANPINAR,EYYÜBİYE,HALFETİ,HALİLİYE,HARRAN,HİLVAN,KARAKÖPRÜ,SİVEREK,SURUÇ,VİRANŞEHİR
+UŞAK:MERKEZ,BANAZ,EŞME,KARAHALLI,SİVASLI,ULUBEY
+VAN:BAHÇESARAY,BAŞKALE,ÇALDIRAN,ÇATAK,EDREMİT,ERCİŞ,GEVAŞ,GÜRPINAR,İPEKYOLU,MURADİYE,ÖZALP,SARAY,TUŞBA
+YOZGAT:MERKEZ,AKDAĞMADENİ,AYDINCIK,BOĞAZLIYAN,ÇANDIR,ÇAYIRALAN,ÇEKEREK,KADIŞEHRİ,SARAYKENT,SARIKAYA,SORGUN,ŞEFAATLİ,YENİFAKILI,YERKÖY
+ZONGULDAK:MERKEZ,ALAPLI,ÇAYCUMA,DEVREK,EREĞLİ,GÖKÇEBEY,KİLİMLİ,KOZLU
+AKSARAY:MERKEZ,AĞAÇÖREN,ESKİL,GÜLAĞAÇ,GÜZELYURT,ORTAKÖY,SARIYAHŞİ,SULTANHANI
+BAYBURT:MERKEZ,AYDINTEPE,DEMİRÖZÜ
+KARAMAN:MERKEZ,AYRANCI,BAŞYAYLA,ERMENEK,KAZIMKARABEKİR,SARIVELİLER
+KIRIKKALE:MERKEZ,BAHŞİLİ,BALIŞEYH,ÇELEBİ,DELİCE,KARAKEÇİLİ,KESKİN,SULAKYURT,YAHŞİHAN
+BATMAN:MERKEZ,BEŞİRİ,GERCÜŞ,HASANKEYF,KOZLUK,SASON
+ŞIRNAK:MERKEZ,BEYTÜŞŞEBAP,CİZRE,GÜÇLÜKONAK,İDİL,SİLOPİ,ULUDERE
+BARTIN:MERKEZ,AMASRA,KURUCAŞİLE,ULUS
+ARDAHAN:MERKEZ,ÇILDIR,DAMAL,GÖLE,HANAK,POSOF
+IĞDIR:MERKEZ,ARALIK,KARAKOYUNLU,TUZLUCA
+YALOVA:MERKEZ,ALTINOVA,ARMUTLU,ÇINARCIK,ÇİFTLİKKÖY,TERMAL
+KARABÜK:MERKEZ,EFLANİ,ESKİPAZAR,OVACIK,SAFRANBOLU,YENİCE
+KİLİS:MERKEZ,ELBEYLİ,MUSABEYLİ,POLATELİ
+OSMANİYE:MERKEZ,BAHÇE,DÜZİÇİ,HASANBEYLİ,KADİRLİ,SUMBAS,TOPRAKKALE
+DÜZCE:MERKEZ,AKÇAKOCA,CUMAYERİ,ÇİLİMLİ,GÖLYAKA,GÜMÜŞOVA,KAYNAŞLI,YIĞILCA
+"""
+
+# Türkçe karakterleri yazmadan girilen adlar için (ÇORLU ~ corlu)
+_ASCII_TABLE = str.maketrans("çğıöşü", "cgiosu")
+# Öneri için gereken en düşük benzerlik (difflib oranı)
+SUGGEST_CUTOFF = 0.75
+
+
+def ascii_fold(value: str | None) -> str:
+    """tr_casefold + Türkçe harflerin ASCII karşılıkları."""
+    return tr_casefold(value).translate(_ASCII_TABLE)
+
+
+@lru_cache(maxsize=1)
+def _catalog() -> dict[str, tuple[str, ...]]:
+    """İl -> ilçeler (kataloğdaki yazımla)."""
+    catalog: dict[str, tuple[str, ...]] = {}
+    for line in _CATALOG.splitlines():
+        province, _, districts = line.partition(":")
+        catalog[province] = tuple(districts.split(","))
+    return catalog
+
+
+@lru_cache(maxsize=None)
+def _folded(names: tuple[str, ...]) -> dict[str, str]:
+    """ascii_fold(ad) -> ad"""
+    return {ascii_fold(name): name for name in names}
+
+
+def provinces() -> list[str]:
+    """İller (alfabetik değil, plaka sırasıyla)."""
+    return list(_catalog())
+
+
+def districts(province: str) -> tuple[str, ...]:
+    """İlin ilçeleri; il kataloğda yoksa boş."""
+    return _catalog().get(province, ())
+
+
+def _match(names: tuple[str, ...], value: str | None) -> str | None:
+    return _folded(names).get(ascii_fold(value))
+
+
+def _suggest(names: tuple[str, ...], value: str | None) -> str | None:
+    folded = _folded(names)
+    close = difflib.get_close_matches(ascii_fold(value), folded, n=1, cutoff=SUGGEST_CUTOFF)
+    return folded[close[0]] if close else None
+
+
+def match_province(value: str | None) -> str | None:
+    """Büyük/küçük harf ve Türkçe karakterden bağımsız tam eşleşen il (kataloğdaki yazımla)."""
+    return _match(tuple(_catalog()), value)
+
+
+def suggest_province(value: str | None) -> str | None:
+    """Yazım hatalı il adı için en yakın il (yoksa None)."""
+    return _suggest(tuple(_catalog()), value)
+
+
+def match_district(province: str, value: str | None) -> str | None:
+    """İlin ilçelerinden tam eşleşen (il adının kendisi il geneli demektir)."""
+    if ascii_fold(value) == ascii_fold(province):
+        return province
+    return _match(districts(province), value)
+
+
+def suggest_district(province: str, value: str | None) -> str | None:
+    return _suggest(districts(province), value)
+
+
+def canonical_location(city: str, county: str) -> tuple[str, str]:
+    """Kataloğda varsa il/ilçenin kataloğdaki yazımı; yoksa girildiği gibi."""
+    province = match_province(city)
+    if province is None:
+        return city, county
+    return province, match_district(province, county) or county
@@ -0,0 +1,112 @@
+"""Entegrasyona ait aiohttp session'ı: eczaneleri.net için ayarlı kalıcı bağlantı havuzu.
+
+HA'nın genel session'ı yerine tüm entry'ler bu session'ı paylaşır: boşta kalan
+bağlantılar HTTP_KEEPALIVE_TIMEOUT boyunca havuzda tutulur, DNS sonuçları
+HTTP_DNS_CACHE_TTL boyunca önbellekte kalır, gzip/deflate (brotli kuruluysa br)
+istenir. Bağlantı yeniden kullanımı trace sayaçlarıyla izlenir. Son entry
+kaldırıldığında (veya HA kapanırken) session ve havuzdaki bağlantılar kapatılır.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .api import request_headers, request_timeout
+from .const import DATA_HTTP_CLIENT, DOMAIN, HTTP_DNS_CACHE_TTL, HTTP_KEEPALIVE_TIMEOUT
+
+
+@dataclass
+class ClientStats:
+    """Session genelinde istek, bağlantı ve DNS önbelleği sayaçları."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def connection_reuse_ratio(self) -> float | None:
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else None
+
+
+@dataclass
+class HttpClient:
+    session: ClientSession
+    stats: ClientStats = field(default_factory=ClientStats)
+    # HA kapanış dinleyicisinin iptali
+    unsub_close: Callable[[], None] | None = None
+
+
+def _trace_config(stats: ClientStats) -> TraceConfig:
+    trace = TraceConfig()
+
+    async def _on_request_start(_session, _ctx, _params) -> None:
+        stats.requests += 1
+
+    async def _on_connection_create_end(_session, _ctx, _params) -> None:
+        stats.connections_created += 1
+
+    async def _on_connection_reuseconn(_session, _ctx, _params) -> None:
+        stats.connections_reused += 1
+
+    async def _on_dns_cache_hit(_session, _ctx, _params) -> None:
+        stats.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(_session, _ctx, _params) -> None:
+        stats.dns_cache_misses += 1
+
+    trace.on_request_start.append(_on_request_start)
+    trace.on_connection_create_end.append(_on_connection_create_end)
+    trace.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace.on_dns_cache_hit.append(_on_dns_cache_hit)
+    trace.on_dns_cache_miss.append(_on_dns_cache_miss)
+    return trace
+
+
+@callback
+def async_get_http_client(hass: HomeAssistant) -> HttpClient:
+    """Entegrasyon genelindeki session'ı döndür (ilk çağrıda oluşturulur)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    client: HttpClient | None = domain_data.get(DATA_HTTP_CLIENT)
+    if client is not None:
+        return client
+
+    stats = ClientStats()
+    connector = TCPConnector(
+        ssl=get_default_context(),
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    session = ClientSession(
+        connector=connector,
+        timeout=request_timeout(),
+        headers=request_headers(),
+        trace_configs=[_trace_config(stats)],
+    )
+    client = domain_data[DATA_HTTP_CLIENT] = HttpClient(session, stats)
+
+    async def _async_close(_event: Event) -> None:
+        client.unsub_close = None
+        await async_close_http_client(hass)
+
+    client.unsub_close = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return client
+
+
+async def async_close_http_client(hass: HomeAssistant) -> None:
+    """Session'ı ve havuzdaki bağlantıları kapat (sonraki istekte yeniden oluşturulur)."""
+    client: HttpClient | None = hass.data.get(DOMAIN, {}).pop(DATA_HTTP_CLIENT, None)
+    if client is None:
+        return
+    if client.unsub_close is not None:
+        client.unsub_close()
+        client.unsub_close = None
+    await client.session.close()
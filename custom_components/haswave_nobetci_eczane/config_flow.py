@@ -12,15 +12,37 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
+    CONF_ALL_DISTRICTS,
+    CONF_ENTITY_MODE,
+    CONF_FULL_ROSTER,
+    CONF_TRACKED_ENTITY,
+    DEFAULT_ENTITY_MODE,
     DEFAULT_SENSOR_COUNT,
+    DEFAULT_TRACKED_ENTITY,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    ENTITY_MODE_ROSTER,
+    ENTITY_MODE_SLOTS,
+    ROSTER_FETCH_LIMIT,
     UPDATE_INTERVAL_1_HOUR,
     UPDATE_INTERVAL_24_HOURS,
+    UPDATE_INTERVAL_DUTY_DAY,
 )
 from .api import HasWaveEczaneAPI
+from .cache import async_store_probe
+from .catalog import (
+    districts,
+    match_district,
+    match_province,
+    provinces,
+    suggest_district,
+    suggest_province,
+)
+from .util import location_key, split_districts
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,8 +69,16 @@ def _get_schema(strings: dict | None = None) -> vol.Schema:
     # Ama manuel olarak da ekleyebiliriz
     return vol.Schema(
         {
-            vol.Required("city"): str,
+            # Katalogdaki iller; listede olmayan yazım da girilebilir (doğrulamada öneri sunulur)
+            vol.Required("city"): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=provinces(),
+                    custom_value=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
             vol.Optional("district", default=""): str,
+            vol.Optional(CONF_ALL_DISTRICTS, default=False): bool,
             vol.Required("sensor_count", default=DEFAULT_SENSOR_COUNT): vol.Coerce(int),
         }
     )
@@ -66,19 +96,34 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     
     if sensor_count < 1 or sensor_count > 20:
         raise ValueError("Sensor sayısı 1-20 arası olmalıdır")
-    
+
+    # Ağa gitmeden il/ilçe kontrolü; kataloğdaki yazım saklanır
+    data = dict(data)
+    all_districts = data.pop(CONF_ALL_DISTRICTS, False)
+    data.update(
+        _canonical_location(data.get("city", ""), "" if all_districts else data.get("district", ""))
+    )
+    if all_districts:
+        # İl geneli: yazılan ilçe yerine katalogdaki tüm ilçeler (her biri ayrı liste)
+        data["district"] = ", ".join(districts(data["city"]))
+
+    # Koordinatörün varsayılanıyla aynı limit (il geneli entry'de tüm liste):
+    # doğrulama sonucu ilk güncellemede kullanılabilsin
     api = HasWaveEczaneAPI(
         city=data["city"],
-        district=data.get("district", ""),
-        limit=sensor_count,
+        district=data["district"],
+        limit=sensor_count if data["district"] else ROSTER_FETCH_LIMIT,
     )
     
-    # Sync fetch (eczaneleri.net iframe) - config flow executor'da çalışır
-    result = await hass.async_add_executor_job(api.fetch_pharmacies)
+    # Tek deneme ve HA'nın ortak session'ı: entry oluşmazsa açık kalan session olmaz
+    try:
+        result = await api.async_probe(async_get_clientsession(hass))
+    except Exception as err:
+        _LOGGER.warning("Eczaneleri.net doğrulama isteği başarısız: %s", err)
+        raise CannotConnect from err
 
-    # None dönerse bağlantı/parse hatası
-    if result is None:
-        raise CannotConnect
+    # Entry kurulunca ilk güncelleme aynı sayfayı tekrar çekmesin
+    async_store_probe(hass, location_key(api.city, api.district), api.limit, result)
 
     # Boş liste geçerli (il/ilçe doğru, o gün eczane çıkmamış olabilir)
     if isinstance(result, list):
@@ -91,7 +136,21 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         else:
             _LOGGER.info("Eczaneleri.net bağlantı başarılı: %s eczane", len(result))
 
-    return {"title": f"Nöbetçi Eczane - {data.get('city', '')}"}
+    return {"title": f"Nöbetçi Eczane - {data.get('city', '')}", "data": data}
+
+
+def _canonical_location(city: str, district: str) -> dict[str, str]:
+    """Katalogla eşleşen il/ilçeler (kataloğdaki yazımla); eşleşmeyen girişte InvalidLocation."""
+    province = match_province(city)
+    if province is None:
+        raise InvalidLocation("invalid_city", city, suggest_province(city))
+    districts = []
+    for name in split_districts(district):
+        county = match_district(province, name)
+        if county is None:
+            raise InvalidLocation("invalid_district", name, suggest_district(province, name))
+        districts.append(county)
+    return {"city": province, "district": ", ".join(districts)}
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -104,8 +163,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the initial step."""
         strings = await self.hass.async_add_executor_job(_load_strings)
-        step_strings = strings.get("config", {}).get("step", {}).get("user", {})
-        error_strings = strings.get("config", {}).get("error", {})
         
         if user_input is None:
             return self.async_show_form(
@@ -114,24 +171,30 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
         
         errors = {}
+        placeholders = {}
         
         try:
             info = await validate_input(self.hass, user_input)
+        except InvalidLocation as e:
+            # Öneri varsa "<hata>_suggestion" anahtarı (metin translations/ altında)
+            errors["base"] = f"{e.error}_suggestion" if e.suggestion else e.error
+            placeholders = {"value": e.value, "suggestion": e.suggestion or ""}
         except CannotConnect:
-            errors["base"] = error_strings.get("cannot_connect", "cannot_connect")
+            errors["base"] = "cannot_connect"
         except ValueError as e:
-            errors["base"] = error_strings.get("invalid_sensor_count", "invalid_sensor_count")
+            errors["base"] = "invalid_sensor_count"
             _LOGGER.error(f"Geçersiz sensor sayısı: {e}")
         except Exception:
             _LOGGER.exception("Unexpected exception")
-            errors["base"] = error_strings.get("unknown", "unknown")
+            errors["base"] = "unknown"
         else:
-            return self.async_create_entry(title=info["title"], data=user_input)
+            return self.async_create_entry(title=info["title"], data=info["data"])
         
         return self.async_show_form(
             step_id="user",
             data_schema=_get_schema(strings),
             errors=errors,
+            description_placeholders=placeholders,
         )
 
     @staticmethod
@@ -140,7 +203,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    """Güncelleme sıklığı (Yapılandır tıklanınca açılır)."""
+    """Güncelleme sıklığı, izlenen konum ve entity modu (Yapılandır tıklanınca açılır)."""
 
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self._config_entry = config_entry
@@ -156,7 +219,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             current = int(current)
         except (TypeError, ValueError):
             current = DEFAULT_UPDATE_INTERVAL
-        if current not in (UPDATE_INTERVAL_1_HOUR, UPDATE_INTERVAL_24_HOURS):
+        if current not in (UPDATE_INTERVAL_1_HOUR, UPDATE_INTERVAL_24_HOURS, UPDATE_INTERVAL_DUTY_DAY):
             current = DEFAULT_UPDATE_INTERVAL
 
         return self.async_show_form(
@@ -168,7 +231,25 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 ): vol.In({
                     UPDATE_INTERVAL_1_HOUR: "1 saat",
                     UPDATE_INTERVAL_24_HOURS: "24 saat",
+                    UPDATE_INTERVAL_DUTY_DAY: "Nöbet değişimine göre (08:30)",
                 }),
+                vol.Required(
+                    CONF_TRACKED_ENTITY,
+                    default=opts.get(CONF_TRACKED_ENTITY) or DEFAULT_TRACKED_ENTITY,
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=["zone", "person", "device_tracker"])
+                ),
+                vol.Required(
+                    CONF_ENTITY_MODE,
+                    default=opts.get(CONF_ENTITY_MODE, DEFAULT_ENTITY_MODE),
+                ): vol.In({
+                    ENTITY_MODE_SLOTS: "Her eczane ayrı sensor",
+                    ENTITY_MODE_ROSTER: "Tüm liste tek sensor'da",
+                }),
+                vol.Required(
+                    CONF_FULL_ROSTER,
+                    default=opts.get(CONF_FULL_ROSTER, not split_districts(data.get("district"))),
+                ): bool,
             }),
         )
 
@@ -176,3 +257,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
+
+class InvalidLocation(HomeAssistantError):
+    """Error to indicate the city or district is not in the catalog."""
+
+    def __init__(self, error: str, value: str, suggestion: str | None) -> None:
+        super().__init__(error)
+        self.error = error
+        self.value = value
+        self.suggestion = suggestion
@@ -8,4 +8,57 @@ CONF_UPDATE_INTERVAL = "update_interval"
 DEFAULT_UPDATE_INTERVAL = 3600  # 1 saat
 UPDATE_INTERVAL_1_HOUR = 3600
 UPDATE_INTERVAL_24_HOURS = 86400
+# Sabit aralık yerine nöbet değişimine (08:30) göre zamanlama
+UPDATE_INTERVAL_DUTY_DAY = 0
 DEFAULT_SENSOR_COUNT = 5
+# Tüm liste istendiğinde (arama / en yakın eczane) konum başına çekilen en fazla eczane;
+# bu limitte sayfa streaming yerine bir kez tam okunup parse edilir
+ROSTER_FETCH_LIMIT = 500
+# hass.data[DOMAIN] içinde paylaşılan (il, ilçe) koordinatör kaydı
+DATA_COORDINATORS = "coordinators"
+# HTML parser motorları: tek geçişli html.parser (varsayılan) veya BeautifulSoup
+PARSER_ENGINE_STREAM = "stream"
+PARSER_ENGINE_BS4 = "bs4"
+# hass.data[DOMAIN] içinde diskteki son liste önbelleği
+DATA_ROSTER_CACHE = "roster_cache"
+# fetch_many / çok ilçeli entry'lerde eşzamanlı istek sınırı
+DEFAULT_FETCH_CONCURRENCY = 4
+# Bu boyutun (bayt) altındaki sayfalar event loop'ta parse edilir; büyükleri executor'a gider.
+# stream motorunda bu kadar bayt okunduğu halde istenen eczaneler bulunamadıysa
+# kalan gövde okunup sayfa executor'da baştan parse edilir
+PARSE_INLINE_MAX_BYTES = 16384
+# Streaming okumada parça boyutu (bayt)
+STREAM_CHUNK_SIZE = 8192
+# hass.data[DOMAIN] içinde config flow doğrulama sonuçları (ilk güncellemede kullanılır)
+DATA_PROBE_CACHE = "probe_cache"
+# En yakın eczane sensor'ının konumunu izlediği entity (zone / person / device_tracker)
+CONF_TRACKED_ENTITY = "tracked_entity"
+DEFAULT_TRACKED_ENTITY = "zone.home"
+# İzlenen konum bu mesafeden (metre) az değiştiyse en yakın eczane yeniden hesaplanmaz
+NEAREST_MOVE_THRESHOLD_M = 100
+# Fetch sayaçları değişip eczane listesi değişmediğinde yalnızca bu bağlamdaki
+# (diagnostic) dinleyiciler bilgilendirilir
+COORDINATOR_CONTEXT_DIAGNOSTIC = "diagnostic"
+# hass.data[DOMAIN] içinde nöbet listesi geçmişi (SQLite) ve saklama süresi (gün)
+DATA_HISTORY = "history"
+HISTORY_RETENTION_DAYS = 365
+# Entity modu: sıra başına bir sensor (varsayılan) veya tüm liste tek sensor'da
+CONF_ENTITY_MODE = "entity_mode"
+ENTITY_MODE_SLOTS = "slots"
+ENTITY_MODE_ROSTER = "roster"
+DEFAULT_ENTITY_MODE = ENTITY_MODE_SLOTS
+# Sensor sayısı yerine konumun tüm nöbet listesini çek (varsayılan: il geneli entry'lerde açık)
+CONF_FULL_ROSTER = "full_roster"
+# Config flow: ilçe yazmak yerine ilin katalogdaki tüm ilçeleri (ilçe başına liste)
+CONF_ALL_DISTRICTS = "all_districts"
+# hass.data[DOMAIN] içinde entegrasyona ait aiohttp session'ı (eczaneleri.net için ayarlı)
+DATA_HTTP_CLIENT = "http_client"
+# İstek zaman aşımları (saniye): bağlantı kurma, okumalar arası bekleme ve toplam
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 10
+HTTP_TOTAL_TIMEOUT = 15
+# Boşta kalan bağlantının havuzda tutulma süresi ve DNS önbelleği (saniye)
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_DNS_CACHE_TTL = 300
+# Güncelle butonu / refresh servisi: veri bu süreden (saniye) yeniyse yeni istek yapılmaz
+MANUAL_REFRESH_MIN_AGE = 60
@@ -0,0 +1,425 @@
+"""Aynı (il, ilçe) için tüm config entry'lerin paylaştığı veri koordinatörü."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, NamedTuple
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import HasWaveEczaneAPI
+from .cache import RosterCache, async_get_roster_cache, async_pop_probe
+from .client import async_get_http_client
+from .const import (
+    COORDINATOR_CONTEXT_DIAGNOSTIC,
+    DATA_COORDINATORS,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    MANUAL_REFRESH_MIN_AGE,
+    ROSTER_FETCH_LIMIT,
+    UPDATE_INTERVAL_DUTY_DAY,
+)
+from .geo import GeoIndex
+from .history import RosterHistory, async_get_history
+from .models import Pharmacy
+from .roster import RosterIndex
+from .scheduler import TR_TZ, awaiting_changeover, next_refresh_delay, window_start
+from .util import location_key
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SensorSlot(NamedTuple):
+    """Bir sensor sırasının yenileme başına bir kez hesaplanan durumu."""
+
+    name: str | None
+    attributes: dict[str, Any]
+    fingerprint: tuple[Any, ...]
+
+
+EMPTY_SLOT = SensorSlot(None, {}, (None, ()))
+
+
+def _build_slot(pharmacy: Pharmacy, extra: dict[str, Any]) -> SensorSlot:
+    attributes: dict[str, Any] = {}
+    if pharmacy.phone:
+        attributes["phone"] = pharmacy.phone_formatted
+    if pharmacy.address:
+        attributes["address"] = pharmacy.address
+    if pharmacy.map_link:
+        attributes["map_link"] = pharmacy.map_link
+    attributes.update(extra)
+    name = pharmacy.name or None
+    return SensorSlot(name, attributes, (name, tuple(attributes.items())))
+
+
+def _first_per_county(pharmacies: list[Pharmacy], limit: int) -> list[Pharmacy]:
+    """Her ilçenin (liste sırasıyla) ilk `limit` eczanesi; tek ilçede listenin başı."""
+    counts: dict[str, int] = {}
+    view: list[Pharmacy] = []
+    for pharmacy in pharmacies:
+        count = counts.get(pharmacy.county, 0)
+        if count < limit:
+            counts[pharmacy.county] = count + 1
+            view.append(pharmacy)
+    return view
+
+
+class EczaneDataUpdateCoordinator(DataUpdateCoordinator[list[Pharmacy]]):
+    """Bir (il, ilçe) için tek fetch yapan, sonucu abone entry'lere dağıtan koordinatör."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        city: str,
+        district: str,
+        roster_cache: RosterCache | None = None,
+        history: RosterHistory | None = None,
+    ) -> None:
+        self.key = location_key(city, district)
+        self._roster_cache = roster_cache
+        self._history = history
+        # Veri diskteki önbellekten geldiyse kayıt zamanı (canlı veri gelince None)
+        self.cached_at: datetime | None = None
+        # Mevcut verinin alındığı zaman; son istek başarısızsa veri eski (stale) sayılır
+        self.data_updated: datetime | None = None
+        self.stale = False
+        self.api = HasWaveEczaneAPI(city=city, district=district, limit=1)
+        # entry_id -> (sensor_count, update_interval, tüm liste isteniyor mu)
+        self._subscribers: dict[str, tuple[int, int, bool]] = {}
+        self._refresh_lock = asyncio.Lock()
+        # Devam eden fetch (zamanlanmış veya manuel); manuel yenilemeler buna katılır
+        self._in_flight: asyncio.Future[None] | None = None
+        self._manual_refresh: asyncio.Task[None] | None = None
+        # Son başarılı fetch'te istenen eczane sayısı
+        self._fetched_limit = 0
+        # Nöbet günü modu: değişmiş listenin en son görüldüğü (TR) tarih
+        self._changed_on: date | None = None
+        # (yerel tarih, o günün penceresinden önce geçerli olan liste): değişim bununla karşılaştırılır
+        self._previous_roster: tuple[date, list[Pharmacy]] | None = None
+        # Dinleyicilere en son bildirilen durum; aynı liste nesnesi gelirse yazım atlanır
+        self._notified: tuple[Any, bool, bool] | None = None
+        # (kesilen liste, sensor sayısı -> entry'nin listesi)
+        self._views: tuple[Any, dict[int, list[Pharmacy]]] = (None, {})
+        # Sensor sayısı -> sensor sıralarının hazır durumu (veri değişince yeniden hesaplanır)
+        self._slots: dict[int, list[SensorSlot]] | None = None
+        # (indekslenen liste, koordinat indeksi) ve (indekslenen liste, arama indeksi)
+        self._geo: tuple[Any, GeoIndex] | None = None
+        self._roster: tuple[Any, RosterIndex] | None = None
+        # Koordinatör tek bir entry'ye ait değil; ilk kuran entry kaldırılınca
+        # kapanmasın diye current_entry bağlamı dışında oluşturulur.
+        token = config_entries.current_entry.set(None)
+        try:
+            super().__init__(
+                hass,
+                _LOGGER,
+                name=f"{DOMAIN} {self.api.city}/{self.api.district or self.api.city}",
+                update_interval=timedelta(seconds=DEFAULT_UPDATE_INTERVAL),
+            )
+        finally:
+            config_entries.current_entry.reset(token)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def data_for(self, limit: int) -> list[Pharmacy]:
+        """Entry'nin tüm listeden kesilmiş kısmı: ilçe başına ilk `limit` eczane."""
+        if self._views[0] is not self.data:
+            self._views = (self.data, {})
+        views = self._views[1]
+        if limit not in views:
+            views[limit] = _first_per_county(self.data or [], limit)
+        return views[limit]
+
+    def stale_attributes(self) -> dict[str, Any]:
+        """Son istek başarısızsa eski veri gösterilir; yaşı ile işaretle."""
+        if not self.stale:
+            return {}
+        extra: dict[str, Any] = {"stale": True}
+        age = self.data_age
+        if age is not None:
+            extra["data_age_minutes"] = int(age.total_seconds() // 60)
+        return extra
+
+    def slot(self, limit: int, index: int) -> SensorSlot:
+        """data_for(limit) listesinde 1'den başlayan sıradaki eczanenin durumu ve parmak izi."""
+        if self._slots is None:
+            self._slots = {}
+        slots = self._slots.get(limit)
+        if slots is None:
+            extra = self.stale_attributes()
+            slots = self._slots[limit] = [
+                _build_slot(pharmacy, extra) for pharmacy in self.data_for(limit)
+            ]
+        if 1 <= index <= len(slots):
+            return slots[index - 1]
+        return EMPTY_SLOT
+
+    @property
+    def geo_index(self) -> GeoIndex:
+        """Mevcut liste için koordinat indeksi (liste değişince bir kez yeniden kurulur)."""
+        if self._geo is None or self._geo[0] is not self.data:
+            self._geo = (self.data, GeoIndex(self.data or []))
+        return self._geo[1]
+
+    @property
+    def roster_index(self) -> RosterIndex:
+        """Mevcut liste için ilçe / eczane adı indeksi (liste değişince bir kez yeniden kurulur)."""
+        if self._roster is None or self._roster[0] is not self.data:
+            self._roster = (self.data, RosterIndex(self.api.city, self.data or []))
+        return self._roster[1]
+
+    def _apply_subscribers(self) -> None:
+        """Abonelere göre çekilecek eczane sayısını ve güncelleme aralığını belirle.
+
+        Bir abone tüm listeyi istiyorsa (arama / en yakın eczane) ROSTER_FETCH_LIMIT,
+        aksi halde en büyük sensor sayısı kadar (ilçe başına) eczane çekilir.
+        """
+        if not self._subscribers:
+            return
+        if any(full for _, _, full in self._subscribers.values()):
+            self.api.limit = ROSTER_FETCH_LIMIT
+        else:
+            self.api.limit = max(limit for limit, _, _ in self._subscribers.values())
+        self.update_interval = self._next_interval()
+
+    def _next_interval(self) -> timedelta:
+        """Sabit aralıklı abonelerin en kısası ile nöbet günü zamanlamasının erken olanı."""
+        intervals = [interval for _, interval, _ in self._subscribers.values()]
+        fixed = [i for i in intervals if i != UPDATE_INTERVAL_DUTY_DAY]
+        candidates = [timedelta(seconds=min(fixed))] if fixed else []
+        if len(fixed) != len(intervals):
+            candidates.append(next_refresh_delay(dt_util.utcnow(), self._changed_on))
+        return min(candidates) if candidates else timedelta(seconds=DEFAULT_UPDATE_INTERVAL)
+
+    async def async_add_entry(
+        self, entry_id: str, limit: int, update_interval: int, full_roster: bool = False
+    ) -> None:
+        """Entry'yi abone yap; veri yoksa veya daha fazla eczane gerekiyorsa yenile."""
+        self._subscribers[entry_id] = (limit, update_interval, full_roster)
+        self._apply_subscribers()
+        async with self._refresh_lock:
+            if self.data is None and self._async_seed_from_cache():
+                # Sensor'lar önbellekten dolar; canlı veri arka planda çekilir
+                self.hass.async_create_background_task(
+                    self.async_refresh(), f"{self.name} ilk güncelleme"
+                )
+                return
+            if self.data is None or (
+                self.api.limit > self._fetched_limit and self.cached_at is None
+            ):
+                await self.async_refresh()
+
+    @callback
+    def _async_seed_from_cache(self) -> bool:
+        """Diskteki son listeyi veri olarak yükle; bulunduysa True."""
+        if self._roster_cache is None:
+            return False
+        cached = self._roster_cache.get(self.key)
+        if cached is None:
+            return False
+        pharmacies, updated = cached
+        self.data = pharmacies
+        self._slots = None
+        self.cached_at = updated
+        self.data_updated = updated
+        self.stale = True
+        _LOGGER.debug(
+            "%s: önbellekten %s eczane yüklendi (%s)", self.name, len(pharmacies), updated
+        )
+        return True
+
+    def async_remove_entry(self, entry_id: str) -> bool:
+        """Aboneliği kaldır; başka abone kalmadıysa True döner."""
+        self._subscribers.pop(entry_id, None)
+        self._apply_subscribers()
+        return not self._subscribers
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Mevcut verinin yaşı."""
+        if self.data_updated is None:
+            return None
+        return dt_util.utcnow() - self.data_updated
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Veri (aynı nesne) ve durum değişmediyse entity'leri yeniden yazma.
+
+        Eski veri gösterilirken yaşı değiştiği için her yenilemede bildirilir;
+        sensor'lar yalnızca kendi sıraları değiştiyse yazar. Fetch sayaçları her
+        yenilemede değiştiğinden diagnostic sensor'lar her durumda bildirilir.
+        """
+        notified = (self.data, self.last_update_success, self.stale)
+        if (
+            not self.stale
+            and self._notified is not None
+            and self._notified[0] is notified[0]
+            and self._notified[1:] == notified[1:]
+        ):
+            for update_callback, context in list(self._listeners.values()):
+                if context == COORDINATOR_CONTEXT_DIAGNOSTIC:
+                    update_callback()
+            return
+        self._notified = notified
+        self._slots = None
+        super().async_update_listeners()
+
+    async def async_manual_refresh(self) -> bool:
+        """Güncelle butonu / refresh servisi için yenileme; yeni istek yapıldıysa True.
+
+        Devam eden bir fetch varsa yeni istek yapılmaz, onun bitmesi beklenir.
+        Veri MANUAL_REFRESH_MIN_AGE saniyeden yeniyse mevcut veri kullanılır.
+        """
+        waiter = self._manual_refresh or self._in_flight
+        if waiter is not None:
+            _LOGGER.debug("%s: devam eden güncellemeye katılındı", self.name)
+            await asyncio.shield(waiter)
+            return False
+        age = self.data_age
+        if (
+            self.last_update_success
+            and not self.stale
+            and age is not None
+            and age < timedelta(seconds=MANUAL_REFRESH_MIN_AGE)
+        ):
+            _LOGGER.debug("%s: veri %s önce alındı, yenileme atlandı", self.name, age)
+            return False
+        task = self._manual_refresh = self.hass.async_create_task(
+            self.async_refresh(), f"{self.name} manuel güncelleme"
+        )
+
+        def _done(_task: asyncio.Task[None]) -> None:
+            if self._manual_refresh is task:
+                self._manual_refresh = None
+
+        task.add_done_callback(_done)
+        await asyncio.shield(task)
+        return True
+
+    async def _async_update_data(self) -> list[Pharmacy]:
+        in_flight = self._in_flight = self.hass.loop.create_future()
+        try:
+            return await self._async_fetch_data()
+        finally:
+            in_flight.set_result(None)
+            if self._in_flight is in_flight:
+                self._in_flight = None
+
+    async def _async_fetch_data(self) -> list[Pharmacy]:
+        """Eczaneleri.net iframe'den veri çek (aiohttp)."""
+        try:
+            session = async_get_http_client(self.hass).session
+            limit = self.api.limit
+            # Kurulumda config flow aynı sayfayı az önce çektiyse tekrar istek atma
+            result = async_pop_probe(self.hass, self.key, limit)
+            if result is None:
+                result = await self.api.async_fetch(session)
+            else:
+                _LOGGER.debug("%s: config flow doğrulama sonucu kullanıldı", self.name)
+            if result is not None:
+                self._fetched_limit = limit
+                self.cached_at = None
+                now = dt_util.utcnow()
+                self.stale = False
+                if awaiting_changeover(now, self._changed_on):
+                    self._check_changeover(now, result)
+                self.data_updated = now
+                if self._roster_cache is not None and result is not self.data:
+                    self._roster_cache.async_set(self.key, limit, result)
+                if self._history is not None and result is not self.data:
+                    self.hass.async_create_background_task(
+                        self._history.async_record(self.key, result),
+                        f"{self.name} geçmiş kaydı",
+                    )
+                _LOGGER.debug("Eczaneleri.net: %s eczane verisi alındı", len(result))
+            else:
+                _LOGGER.warning("Eczaneleri.net veri alınamadı")
+            # Bir sonraki yenileme bu aralığa göre planlanır
+            self.update_interval = self._next_interval()
+        except Exception as err:
+            _LOGGER.error("Veri güncelleme hatası: %s", err, exc_info=True)
+            result = None
+        return result if result is not None else self._stale_data()
+
+    def _check_changeover(self, now: datetime, result: list[Pharmacy]) -> None:
+        """Pencereden sonraki fetch: liste önceki nöbet gününkinden farklıysa değişim görüldü.
+
+        Önceki günün listesi, bugünkü pencereden önce alınmış (veya diskteki
+        önbellekten yüklenmiş) son listedir. Bilinmiyorsa (ör. HA pencere
+        içinde başladı) değişim kabul edilmez; pencere içinde sık, sonra
+        saatlik denenmeye devam edilir.
+        """
+        today = now.astimezone(TR_TZ).date()
+        if self._previous_roster is None or self._previous_roster[0] != today:
+            self._previous_roster = None
+            if (
+                self.data is not None
+                and self.data_updated is not None
+                and self.data_updated < window_start(now)
+            ):
+                self._previous_roster = (today, self.data)
+        if self._previous_roster is None:
+            return
+        # Çekilen eczane sayısı değişmiş olabilir: ortak uzunlukta karşılaştır
+        previous = self._previous_roster[1]
+        common = min(len(previous), len(result))
+        if result[:common] != previous[:common] or (not common and previous != result):
+            self._changed_on = today
+
+    def _stale_data(self) -> list[Pharmacy]:
+        """Fetch başarısız: son başarılı veriyi eski olarak işaretleyip koru.
+
+        Gösterilecek veri yoksa UpdateFailed: entity'ler kullanılamaz görünür.
+        """
+        if self.data is None:
+            raise UpdateFailed(f"{self.name}: veri alınamadı ve önceki liste yok")
+        self.stale = True
+        _LOGGER.info(
+            "%s: son başarılı veri kullanılıyor (%s önce alındı)", self.name, self.data_age
+        )
+        return self.data
+
+
+async def async_acquire_coordinator(
+    hass: HomeAssistant,
+    entry_id: str,
+    city: str,
+    district: str,
+    limit: int,
+    update_interval: int,
+    full_roster: bool = False,
+) -> EczaneDataUpdateCoordinator:
+    """(il, ilçe) için paylaşılan koordinatörü al (yoksa oluştur) ve entry'yi abone et."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    registry: dict[tuple[str, str], EczaneDataUpdateCoordinator] = domain_data.setdefault(
+        DATA_COORDINATORS, {}
+    )
+    key = location_key(city, district)
+    coordinator = registry.get(key)
+    if coordinator is None:
+        roster_cache = await async_get_roster_cache(hass)
+        history = await async_get_history(hass)
+        coordinator = registry.get(key)
+    if coordinator is None:
+        coordinator = EczaneDataUpdateCoordinator(hass, city, district, roster_cache, history)
+        registry[key] = coordinator
+    await coordinator.async_add_entry(entry_id, limit, update_interval, full_roster)
+    return coordinator
+
+
+async def async_release_coordinator(
+    hass: HomeAssistant, entry_id: str, coordinator: EczaneDataUpdateCoordinator
+) -> None:
+    """Entry aboneliğini bırak; son abone ise koordinatörü kapat ve kayıttan sil."""
+    if not coordinator.async_remove_entry(entry_id):
+        return
+    registry = hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {})
+    if registry.get(coordinator.key) is coordinator:
+        registry.pop(coordinator.key)
+    await coordinator.async_shutdown()
@@ -0,0 +1,100 @@
+"""HasWave Nöbetçi Eczane için config entry diagnostics çıktısı."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+from urllib.parse import urlsplit
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import api
+from .client import HttpClient
+from .const import DATA_HTTP_CLIENT, DOMAIN
+from .coordinator import EczaneDataUpdateCoordinator
+from .resilience import get_breaker, get_rate_limiter
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Entry ayarları, koordinatör durumu, fetch/parse sayaçları ve son liste."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: EczaneDataUpdateCoordinator = entry_data["coordinator"]
+    client = coordinator.api
+    metrics = client.metrics
+    # Yalnızca mevcut session okunur; diagnostics indirmek yeni session açmasın
+    http_client: HttpClient | None = hass.data[DOMAIN].get(DATA_HTTP_CLIENT)
+    host = urlsplit(api.ECZANELERI_NET_URL).hostname or ""
+    breaker = get_breaker(host)
+    limiter = get_rate_limiter(host)
+    data_age = coordinator.data_age
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+            "sensor_count": entry_data.get("sensor_count"),
+            "tracked_entity": entry_data.get("tracked_entity"),
+        },
+        "coordinator": {
+            "key": list(coordinator.key),
+            "subscribers": coordinator.subscriber_count,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+            "data_updated": coordinator.data_updated,
+            "cached_at": coordinator.cached_at,
+            "data_age_minutes": int(data_age.total_seconds() // 60) if data_age else None,
+        },
+        "api": {
+            "city": client.city,
+            "districts": client.districts,
+            "limit": client.limit,
+            "parser_engine": client.parser_engine,
+            "concurrency": client.concurrency,
+            "conditional_cache": [
+                {
+                    "provider": provider,
+                    "city": city,
+                    "district": district,
+                    "etag": cache.etag,
+                    "last_modified": cache.last_modified,
+                }
+                for (provider, city, district), cache in client.caches.items()
+            ],
+        },
+        "providers": [
+            {"name": provider.name, **asdict(provider.stats)} for provider in client.providers
+        ],
+        "metrics": {**asdict(metrics), "cache_hit_ratio": metrics.cache_hit_ratio},
+        "http_client": (
+            {
+                **asdict(http_client.stats),
+                "connection_reuse_ratio": http_client.stats.connection_reuse_ratio,
+                "accept_encoding": api.accept_encoding(),
+            }
+            if http_client is not None
+            else None
+        ),
+        "parse_stats": asdict(api.PARSE_STATS),
+        "import_seconds": dict(api.IMPORT_SECONDS),
+        "circuit_breaker": {
+            "host": breaker.host,
+            "state": breaker.state,
+            "failures": breaker.failures,
+        },
+        "rate_limiter": {
+            "rate": limiter.rate,
+            "burst": limiter.burst,
+            "tokens": round(limiter.tokens, 2),
+            "waits": limiter.waits,
+            "waited_seconds": round(limiter.waited_seconds, 2),
+        },
+        "pharmacies": [pharmacy.as_dict() for pharmacy in coordinator.data or []],
+    }
@@ -0,0 +1,91 @@
+"""Harita linklerinden koordinat çıkarma ve en yakın eczane araması (Home Assistant bağımlılığı yok)."""
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Iterable
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .models import Pharmacy
+
+EARTH_RADIUS_M = 6_371_000.0
+# Koordinat taşıyabilen sorgu parametreleri (Google Maps / Apple Maps biçimleri)
+_COORD_PARAMS = ("q", "query", "destination", "daddr", "ll", "center")
+_LAT_LON_RE = re.compile(r"(-?\d{1,2}(?:\.\d+)?)\s*,\s*(-?\d{1,3}(?:\.\d+)?)")
+# /maps/@41.15,27.80,17z ve /maps/place/41.15,27.80 biçimleri
+_PATH_RE = re.compile(r"[@/](-?\d{1,2}\.\d+),\s*(-?\d{1,3}\.\d+)")
+
+
+def _valid(lat: float, lon: float) -> bool:
+    return -90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0 and (lat, lon) != (0.0, 0.0)
+
+
+def parse_coordinates(map_link: str | None) -> tuple[float, float] | None:
+    """Harita linkinden (enlem, boylam); bulunamazsa None."""
+    if not map_link:
+        return None
+    try:
+        parts = urlsplit(map_link.strip())
+    except ValueError:
+        return None
+    query = parse_qs(parts.query)
+    matches = [
+        _LAT_LON_RE.fullmatch(value.strip())
+        for key in _COORD_PARAMS
+        for value in query.get(key, ())
+    ]
+    matches.append(_PATH_RE.search(unquote(parts.path)))
+    for match in matches:
+        if match:
+            lat, lon = float(match.group(1)), float(match.group(2))
+            if _valid(lat, lon):
+                return lat, lon
+    return None
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """İki nokta arası büyük daire mesafesi (metre)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    """Bir liste için bir kez kurulan koordinat indeksi.
+
+    Noktalar radyan olarak saklanır; arama önce ucuz eşdikdörtgen yaklaşımla
+    en yakın adayı bulur, mesafe haversine ile kesinleştirilir. Nöbet
+    listeleri birkaç düzine eczaneyi geçmediği için doğrusal tarama yeterlidir.
+    """
+
+    __slots__ = ("_points", "missing")
+
+    def __init__(self, pharmacies: Iterable[Pharmacy]) -> None:
+        # (enlem rad, boylam rad, cos(enlem), (enlem, boylam), eczane)
+        self._points: list[tuple[float, float, float, tuple[float, float], Pharmacy]] = []
+        # Linkinden koordinat çıkarılamayan eczane sayısı
+        self.missing = 0
+        for pharmacy in pharmacies:
+            coords = parse_coordinates(pharmacy.map_link)
+            if coords is None:
+                self.missing += 1
+                continue
+            lat, lon = math.radians(coords[0]), math.radians(coords[1])
+            self._points.append((lat, lon, math.cos(lat), coords, pharmacy))
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def nearest(self, lat: float, lon: float) -> tuple[Pharmacy, float] | None:
+        """(en yakın eczane, mesafe metre) veya indeks boşsa None."""
+        if not self._points:
+            return None
+        rlat, rlon = math.radians(lat), math.radians(lon)
+        cos_lat = math.cos(rlat)
+        best = min(
+            self._points,
+            key=lambda p: (p[0] - rlat) ** 2 + ((p[1] - rlon) * (cos_lat + p[2]) / 2) ** 2,
+        )
+        return best[4], haversine_m(lat, lon, *best[3])
@@ -0,0 +1,272 @@
+"""Nöbet listesi geçmişi: (il, ilçe, nöbet günü) başına tek, tekrarsız kayıt.
+
+Kayıtlar config dizinindeki .storage altında bir SQLite dosyasında tutulur.
+Eczaneler ayrı tabloda bir kez saklanır (intern), günlük kayıt yalnızca
+eczane id'lerinin sırasını içerir. Liste değişmedikçe diske yazılmaz; eski
+günler her gün silinir. Tüm SQLite işlemleri executor'da çalışır.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_HISTORY, DOMAIN, HISTORY_RETENTION_DAYS
+from .models import Pharmacy
+from .scheduler import duty_day
+
+_LOGGER = logging.getLogger(__name__)
+
+DB_FILE = f"{DOMAIN}.history.db"
+PRUNE_INTERVAL = timedelta(days=1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pharmacy (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    map_link TEXT NOT NULL,
+    city TEXT NOT NULL,
+    county TEXT NOT NULL,
+    UNIQUE (name, address, phone, map_link, city, county)
+);
+CREATE TABLE IF NOT EXISTS snapshot (
+    city TEXT NOT NULL,
+    county TEXT NOT NULL,
+    duty_day TEXT NOT NULL,
+    pharmacy_ids TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    PRIMARY KEY (city, county, duty_day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS snapshot_duty_day ON snapshot (duty_day);
+"""
+
+
+class HistoryDB:
+    """SQLite erişimi (senkron; executor'dan çağrılır)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        # Executor iş parçacıkları arasında tek bağlantı
+        self._lock = threading.Lock()
+        # Pharmacy -> id (intern önbelleği)
+        self._ids: dict[Pharmacy, int] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _intern(self, conn: sqlite3.Connection, pharmacy: Pharmacy) -> int:
+        pharmacy_id = self._ids.get(pharmacy)
+        if pharmacy_id is not None:
+            return pharmacy_id
+        fields = (
+            pharmacy.name,
+            pharmacy.address,
+            pharmacy.phone,
+            pharmacy.map_link,
+            pharmacy.city,
+            pharmacy.county,
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO pharmacy (name, address, phone, map_link, city, county) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            fields,
+        )
+        (pharmacy_id,) = conn.execute(
+            "SELECT id FROM pharmacy WHERE name = ? AND address = ? AND phone = ? "
+            "AND map_link = ? AND city = ? AND county = ?",
+            fields,
+        ).fetchone()
+        self._ids[pharmacy] = pharmacy_id
+        return pharmacy_id
+
+    def record(
+        self,
+        key: tuple[str, str],
+        day: date,
+        pharmacies: Iterable[Pharmacy],
+        updated: datetime,
+    ) -> bool:
+        """Günün listesini yaz; kayıtlı liste aynıysa dokunmaz. Yazıldıysa True."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                ids = ",".join(str(self._intern(conn, pharmacy)) for pharmacy in pharmacies)
+                cursor = conn.execute(
+                    "INSERT INTO snapshot (city, county, duty_day, pharmacy_ids, updated) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (city, county, duty_day) DO UPDATE SET "
+                    "pharmacy_ids = excluded.pharmacy_ids, updated = excluded.updated "
+                    "WHERE pharmacy_ids != excluded.pharmacy_ids",
+                    (*key, day.isoformat(), ids, updated.isoformat()),
+                )
+                return cursor.rowcount > 0
+
+    def query(
+        self,
+        city: str | None,
+        county: str | None,
+        start: date,
+        end: date,
+    ) -> list[tuple[str, str, str, list[Pharmacy]]]:
+        """[start, end] aralığındaki kayıtlar: (il, ilçe, nöbet günü, eczaneler)."""
+        sql = (
+            "SELECT city, county, duty_day, pharmacy_ids FROM snapshot "
+            "WHERE duty_day BETWEEN ? AND ?"
+        )
+        params: list[Any] = [start.isoformat(), end.isoformat()]
+        if city:
+            sql += " AND city = ?"
+            params.append(city)
+            if county:
+                sql += " AND county = ?"
+                params.append(county)
+        sql += " ORDER BY duty_day, city, county"
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(sql, params).fetchall()
+            wanted = {int(i) for *_, ids in rows for i in ids.split(",") if i}
+            pharmacies = self._load_pharmacies(conn, wanted)
+        return [
+            (city_key, county_key, day, [pharmacies[int(i)] for i in ids.split(",") if i])
+            for city_key, county_key, day, ids in rows
+        ]
+
+    def _load_pharmacies(self, conn: sqlite3.Connection, ids: set[int]) -> dict[int, Pharmacy]:
+        loaded: dict[int, Pharmacy] = {}
+        pending = list(ids)
+        # SQLite parametre sınırının altında kalacak parçalar halinde
+        for start in range(0, len(pending), 500):
+            chunk = pending[start : start + 500]
+            for row in conn.execute(
+                "SELECT id, name, address, phone, map_link, city, county FROM pharmacy "
+                f"WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ):
+                loaded[row[0]] = Pharmacy.create(*row[1:])
+        return loaded
+
+    def prune(self, before: date) -> int:
+        """before gününden eski kayıtları ve artık kullanılmayan eczaneleri sil."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                removed = conn.execute(
+                    "DELETE FROM snapshot WHERE duty_day < ?", (before.isoformat(),)
+                ).rowcount
+                if not removed:
+                    return 0
+                used = {
+                    int(i)
+                    for (ids,) in conn.execute("SELECT pharmacy_ids FROM snapshot")
+                    for i in ids.split(",")
+                    if i
+                }
+                orphans = [
+                    (pharmacy_id,)
+                    for (pharmacy_id,) in conn.execute("SELECT id FROM pharmacy")
+                    if pharmacy_id not in used
+                ]
+                conn.executemany("DELETE FROM pharmacy WHERE id = ?", orphans)
+            self._ids = {p: i for p, i in self._ids.items() if i in used}
+            return removed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RosterHistory:
+    """Koordinatörlerin paylaştığı geçmiş kaydı (HistoryDB'nin async sarmalayıcısı)."""
+
+    def __init__(self, hass: HomeAssistant, db: HistoryDB) -> None:
+        self.hass = hass
+        self.db = db
+        # Son yazılan (nöbet günü, liste); aynı liste için executor'a gidilmez
+        self._last: dict[tuple[str, str], tuple[date, list[Pharmacy]]] = {}
+        self._unsub_prune: Any = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Bir kez: eski günleri sil, günlük temizliği planla."""
+        async with self._lock:
+            if self._loaded:
+                return
+            await self.async_prune()
+            self._unsub_prune = async_track_time_interval(
+                self.hass, self.async_prune, PRUNE_INTERVAL
+            )
+            self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+            self._loaded = True
+
+    async def async_record(self, key: tuple[str, str], pharmacies: list[Pharmacy]) -> None:
+        now = dt_util.utcnow()
+        day = duty_day(now)
+        last = self._last.get(key)
+        if last is not None and last[0] == day and last[1] == pharmacies:
+            return
+        self._last[key] = (day, pharmacies)
+        try:
+            written = await self.hass.async_add_executor_job(
+                self.db.record, key, day, list(pharmacies), now
+            )
+        except sqlite3.Error as err:
+            self._last.pop(key, None)
+            _LOGGER.warning("Nöbet geçmişi yazılamadı: %s", err)
+            return
+        if written:
+            _LOGGER.debug("Nöbet geçmişi: %s %s için %s eczane kaydedildi", key, day, len(pharmacies))
+
+    async def async_query(
+        self, city: str | None, county: str | None, start: date, end: date
+    ) -> list[tuple[str, str, str, list[Pharmacy]]]:
+        return await self.hass.async_add_executor_job(self.db.query, city, county, start, end)
+
+    async def async_prune(self, _now: datetime | None = None) -> None:
+        before = duty_day(dt_util.utcnow()) - timedelta(days=HISTORY_RETENTION_DAYS)
+        try:
+            removed = await self.hass.async_add_executor_job(self.db.prune, before)
+        except sqlite3.Error as err:
+            _LOGGER.warning("Nöbet geçmişi temizlenemedi: %s", err)
+            return
+        if removed:
+            _LOGGER.debug("Nöbet geçmişi: %s eski gün silindi", removed)
+
+    async def _async_stop(self, _event: Event) -> None:
+        if self._unsub_prune is not None:
+            self._unsub_prune()
+            self._unsub_prune = None
+        await self.hass.async_add_executor_job(self.db.close)
+
+
+async def async_get_history(hass: HomeAssistant) -> RosterHistory:
+    """Entegrasyon genelindeki geçmiş kaydını döndür (ilk çağrıda eski günler silinir)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    history: RosterHistory | None = domain_data.get(DATA_HISTORY)
+    if history is None:
+        history = domain_data[DATA_HISTORY] = RosterHistory(
+            hass, HistoryDB(hass.config.path(".storage", DB_FILE))
+        )
+    await history.async_load()
+    return history
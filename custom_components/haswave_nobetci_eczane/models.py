@@ -0,0 +1,77 @@
+"""Nöbetçi eczane kaydı (Home Assistant bağımlılığı yok)."""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+from .util import format_phone_number
+
+# Eski sözlük biçimindeki anahtarlar (önbellek ve dışa aktarım bu biçimi kullanır)
+DICT_KEYS = ("name", "address", "phone", "map_link", "il_ilce")
+IL_ILCE_SEPARATOR = " / "
+
+
+@dataclass(frozen=True, slots=True)
+class Pharmacy:
+    """Tek eczane; değiştirilemez ve hash'lenebilir (karşılaştırma/tekilleştirme için)."""
+
+    name: str
+    address: str = ""
+    # Sadece rakamlar (0 ile başlayan 11 hane)
+    phone: str = ""
+    map_link: str = ""
+    city: str = ""
+    county: str = ""
+    # Sensor attribute'u için bir kez formatlanır
+    phone_formatted: str = field(default="", compare=False, repr=False)
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        address: str = "",
+        phone: str = "",
+        map_link: str = "",
+        city: str = "",
+        county: str = "",
+    ) -> Pharmacy:
+        """İl/ilçe adlarını intern ederek ve telefonu formatlayarak kayıt oluşturur."""
+        return cls(
+            name,
+            address,
+            phone,
+            map_link,
+            sys.intern(city),
+            sys.intern(county),
+            format_phone_number(phone),
+        )
+
+    @property
+    def il_ilce(self) -> str:
+        return f"{self.city}{IL_ILCE_SEPARATOR}{self.county}"
+
+    def as_dict(self) -> dict[str, str]:
+        """Sözlük biçimi (JSON önbelleği ve geriye dönük uyumluluk için)."""
+        return {key: self[key] for key in DICT_KEYS}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Pharmacy:
+        city, _, county = (data.get("il_ilce") or "").partition(IL_ILCE_SEPARATOR)
+        return cls.create(
+            data.get("name") or "",
+            data.get("address") or "",
+            data.get("phone") or "",
+            data.get("map_link") or "",
+            city,
+            county,
+        )
+
+    def __getitem__(self, key: str) -> str:
+        if key not in DICT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict.get uyumlu erişim."""
+        return getattr(self, key) if key in DICT_KEYS else default
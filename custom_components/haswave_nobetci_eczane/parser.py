@@ -0,0 +1,420 @@
+"""Eczaneleri.net iframe HTML'i için tek geçişli (streaming) parser.
+
+BeautifulSoup ağacı kurmadan html.parser olaylarıyla çalışır; BeautifulSoup
+("html.parser") tabanlı _parse_eczaneleri_net_html ile aynı çıktıyı üretir ve
+istenen sayıda eczane tamamlanınca durur.
+"""
+from __future__ import annotations
+
+import re
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Any
+
+from .models import Pharmacy
+from .util import tr_casefold
+
+# BeautifulSoup'un açılır açılmaz kapattığı boş (void) elementler
+_VOID_ELEMENTS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+        "link", "menuitem", "meta", "param", "source", "track", "wbr",
+        "basefont", "bgsound", "command", "frame", "image", "isindex",
+        "nextid", "spacer",
+    }
+)
+# İçindeki metin get_text() çıktısına girmeyen elementler (Script, Stylesheet vb.)
+_NON_TEXT_CONTAINERS = frozenset({"script", "style", "template", "rt", "rp"})
+
+_LIST_CLASS_RE = re.compile(r"list", re.I)
+_PRIMARY_LIST_CLASS = "list-group"
+_DECIMAL_REF_RE = re.compile(r"^([0-9]+)(.*)")
+_HEX_REF_RE = re.compile(r"^([0-9a-f]+)(.*)")
+
+# -- Alan sınıflandırma kuralları ---------------------------------------------
+# li içindeki <a> etiketleri bu tabloyla bir kez sınıflandırılır: href'i desene
+# uyan ilk <a> o alanın kaynağı olur. FIELD_MAPS_ANY yalnızca satırın adres
+# sayılmaması için kullanılır.
+FIELD_TEL = "tel"
+FIELD_MAP = "map"
+FIELD_ECZANE = "eczane"
+FIELD_MAPS_ANY = "maps_any"
+ANCHOR_RULES: tuple[tuple[str, re.Pattern[str]], ...] = (
+    (FIELD_TEL, re.compile(r"^tel:", re.I)),
+    (FIELD_MAP, re.compile(r"google\.com/maps|maps\.google|maps\?q=", re.I)),
+    (FIELD_ECZANE, re.compile(r"eczaneleri\.net", re.I)),
+    (FIELD_MAPS_ANY, re.compile(r"maps")),
+)
+# Metni gerekli olan alanlar (telefon ve eczane adı linkleri)
+_TEXT_FIELDS = frozenset({FIELD_TEL, FIELD_ECZANE})
+
+# Eczane adı linki: bu ifadeyi içeren href'ler (iframe'in kendisi) ad sayılmaz
+NAME_LINK_EXCLUDED_HREF = "iframe"
+NAME_LINK_MIN_LENGTH = 3
+
+# Adres: uzun metin satırı (tel/maps linki olmayan, başlık/ayraç satırı olmayan)
+ADDRESS_MIN_LENGTH = 21
+ADDRESS_EXCLUDED_PREFIX = "http"
+ADDRESS_SEPARATOR = " - "
+ADDRESS_SEPARATOR_WINDOW = 30
+# İl bazlı dışlamalar: bu metinleri içeren satırlar adres sayılmaz (anahtar tr_casefold)
+PROVINCE_ADDRESS_EXCLUSIONS: dict[str, tuple[str, ...]] = {
+    "tekirdağ": ("Tekirdağ",),
+}
+
+# Ad bulunamazsa ilk uygun li metni ad kabul edilir
+NAME_MIN_LENGTH = 3
+NAME_MAX_LENGTH = 80
+NAME_EXCLUDED_PREFIX = "0"
+NAME_EXCLUDED_SUBSTRINGS = ("Yol Tarifi", "http")
+NAME_EXCLUDED_EXACT = frozenset({"Ara"})
+NAME_DIGITS_ONLY_RE = re.compile(r"^[\d\s\-+]+$")
+
+
+def address_exclusions(il_adi: str) -> tuple[str, ...]:
+    """İl için adres satırından dışlanacak metinler."""
+    return PROVINCE_ADDRESS_EXCLUSIONS.get(tr_casefold(il_adi), ())
+
+
+class _StopParsing(Exception):
+    """İstenen sayıda eczane bulundu; kalan HTML işlenmez."""
+
+
+class AnchorRef:
+    __slots__ = ("href", "parts")
+
+    def __init__(self, href: str) -> None:
+        self.href = href
+        self.parts: list[str] = []
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class ListItemFields:
+    """Bir <li> için sınıflandırılmış alanlar (metin + alan başına ilk eşleşen link)."""
+
+    __slots__ = ("parts", "anchors")
+
+    def __init__(self, text: str | None = None) -> None:
+        self.parts: list[str] = [text] if text else []
+        self.anchors: dict[str, AnchorRef] = {}
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def classify(self, anchor: AnchorRef) -> bool:
+        """Linki kural tablosuna göre boş alanlara ata; metni gereken bir alana atandıysa True."""
+        href = anchor.href
+        if not href:
+            return False
+        needs_text = False
+        anchors = self.anchors
+        for field, pattern in ANCHOR_RULES:
+            if field not in anchors and pattern.search(href):
+                anchors[field] = anchor
+                needs_text = needs_text or field in _TEXT_FIELDS
+        return needs_text
+
+
+class _List:
+    __slots__ = ("primary", "items", "closed", "item")
+
+    def __init__(self, primary: bool) -> None:
+        self.primary = primary
+        self.items: list[ListItemFields] = []
+        self.closed = False
+        self.item: Pharmacy | None = None
+
+
+def _normalize_phone(phone: str) -> str:
+    digits = "".join(filter(str.isdigit, phone))
+    if len(digits) == 12 and digits.startswith("90"):
+        digits = "0" + digits[2:]
+    return digits or phone
+
+
+def _is_address(text: str, exclusions: tuple[str, ...]) -> bool:
+    if len(text) < ADDRESS_MIN_LENGTH or text.startswith(ADDRESS_EXCLUDED_PREFIX):
+        return False
+    if ADDRESS_SEPARATOR in text[:ADDRESS_SEPARATOR_WINDOW]:
+        return False
+    return not any(excluded in text for excluded in exclusions)
+
+
+def _is_name_candidate(text: str) -> bool:
+    if not NAME_MIN_LENGTH <= len(text) <= NAME_MAX_LENGTH:
+        return False
+    if text.startswith(NAME_EXCLUDED_PREFIX) or text in NAME_EXCLUDED_EXACT:
+        return False
+    if any(excluded in text for excluded in NAME_EXCLUDED_SUBSTRINGS):
+        return False
+    return not NAME_DIGITS_ONLY_RE.match(text)
+
+
+def build_item(
+    items: list[ListItemFields],
+    il_adi: str,
+    ilce_adi: str,
+    exclusions: tuple[str, ...] = (),
+) -> Pharmacy:
+    """Bir <ul> içindeki sınıflandırılmış li kayıtlarından eczane kaydı üretir."""
+    name = address = phone = map_link = ""
+    for li in items:
+        anchors = li.anchors
+        tel = anchors.get(FIELD_TEL)
+        if tel is not None:
+            phone = _normalize_phone(tel.text() or tel.href)
+        map_anchor = anchors.get(FIELD_MAP)
+        if map_anchor is not None:
+            map_link = map_anchor.href.strip()
+        eczane = anchors.get(FIELD_ECZANE)
+        if eczane is not None and NAME_LINK_EXCLUDED_HREF not in eczane.href:
+            name_candidate = eczane.text()
+            if len(name_candidate) >= NAME_LINK_MIN_LENGTH:
+                name = name_candidate
+        if tel is None and FIELD_MAPS_ANY not in anchors:
+            text = li.text()
+            if len(text) > len(address) and _is_address(text, exclusions):
+                address = text
+
+    if not name:
+        for li in items:
+            t = li.text()
+            if _is_name_candidate(t):
+                name = t
+                break
+        if not name:
+            name = items[-1].text() or items[0].text()
+    return Pharmacy.create(name, address, phone, map_link, il_adi, ilce_adi)
+
+
+class EczaneHTMLParser(HTMLParser):
+    """html.parser olaylarıyla eczane listesini tek geçişte çıkarır.
+
+    feed() ile parça parça beslenebilir; limit kadar eczane kesinleşince
+    ``done`` True olur ve sonraki veriler yok sayılır.
+    """
+
+    def __init__(self, limit: int, il_adi: str, ilce_adi: str) -> None:
+        # Karakter referansları BeautifulSoup ile aynı sonucu vermesi için elle çözülür
+        super().__init__(convert_charrefs=False)
+        self.limit = limit
+        self.il_adi = il_adi
+        self.ilce_adi = ilce_adi
+        self.exclusions = address_exclusions(il_adi)
+        self.done = False
+        # (tag, kayıt) yığını; kayıt _List/ListItemFields/AnchorRef veya None
+        self._stack: list[tuple[str, Any]] = []
+        self._open_counts: dict[str, int] = {}
+        self._closed_voids: dict[str, int] = {}
+        self._lists: list[_List] = []
+        self._open_lists: list[_List] = []
+        self._open_items: list[ListItemFields] = []
+        self._open_anchors: list[AnchorRef] = []
+        self._text: list[str] = []
+        self._hidden_depth = 0
+        self._has_primary = False
+        # _check_complete için: kesinleşmiş ilk birincil listelerin konumu/sayısı
+        self._scan_index = 0
+        self._found = 0
+
+    # -- Besleme ---------------------------------------------------------
+
+    def feed(self, data: str) -> None:
+        if self.done:
+            return
+        try:
+            super().feed(data)
+        except _StopParsing:
+            self.done = True
+
+    def close(self) -> None:
+        if not self.done:
+            try:
+                super().close()
+                self._flush_text()
+                while self._stack:
+                    self._pop()
+            except _StopParsing:
+                pass
+            self.done = True
+
+    def results(self) -> list[Pharmacy]:
+        """Bulunan eczaneler (BeautifulSoup motoruyla aynı sırada ve sayıda)."""
+        lists = [ul for ul in self._lists if ul.primary] if self._has_primary else self._lists
+        pharmacies: list[Pharmacy] = []
+        for ul in lists:
+            if len(pharmacies) >= self.limit:
+                break
+            if ul.item is not None and ul.item.name:
+                pharmacies.append(ul.item)
+        return pharmacies
+
+    # -- Metin -----------------------------------------------------------
+
+    def _flush_text(self) -> None:
+        if not self._text:
+            return
+        text = "".join(self._text).strip()
+        self._text.clear()
+        if not text or self._hidden_depth:
+            return
+        for li in self._open_items:
+            li.parts.append(text)
+        for anchor in self._open_anchors:
+            anchor.parts.append(text)
+
+    def handle_data(self, data: str) -> None:
+        self._text.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        character = html5.get(name + ";") or html5.get(name)
+        self._text.append(character if character is not None else "&" + name)
+
+    def handle_charref(self, name: str) -> None:
+        base, ref_re = 10, _DECIMAL_REF_RE
+        digits = name
+        if name[:1] in ("x", "X"):
+            base, ref_re, digits = 16, _HEX_REF_RE, name[1:]
+        extra = ""
+        try:
+            number: int | None = int(digits, base)
+        except ValueError:
+            match = ref_re.search(digits)
+            number = int(match.group(1), base) if match else None
+            extra = match.group(2) if match else digits
+        if number is not None:
+            self._text.append(unescape(f"&#{number};"))
+        self._text.append(extra)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush_text()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush_text()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush_text()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush_text()
+        if data[:6].upper() == "CDATA[":
+            # CDATA metni gizli elementlerin içinde olsa bile get_text() çıktısına girer
+            text = data[6:].strip()
+            if text:
+                for li in self._open_items:
+                    li.parts.append(text)
+                for anchor in self._open_anchors:
+                    anchor.parts.append(text)
+
+    # -- Etiketler -------------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush_text()
+        self._push(tag, attrs)
+        if tag in _VOID_ELEMENTS:
+            self._pop_to(tag)
+            self._closed_voids[tag] = self._closed_voids.get(tag, 0) + 1
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush_text()
+        self._push(tag, attrs)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._closed_voids.get(tag):
+            # Zaten kapatılmış boş elementin gereksiz kapanışı (<br>...</br>);
+            # BeautifulSoup bunu metni bölmeden yok sayar.
+            self._closed_voids[tag] -= 1
+            return
+        self._flush_text()
+        self._pop_to(tag)
+
+    def _push(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        record: Any = None
+        if tag == "ul":
+            classes = ""
+            for key, value in attrs:
+                if key == "class":
+                    classes = value or ""
+            if _LIST_CLASS_RE.search(classes):
+                record = _List(_PRIMARY_LIST_CLASS in classes.split())
+                self._has_primary = self._has_primary or record.primary
+                self._lists.append(record)
+                self._open_lists.append(record)
+        elif tag == "li":
+            if self._open_lists:
+                record = ListItemFields()
+                for ul in self._open_lists:
+                    ul.items.append(record)
+                self._open_items.append(record)
+        elif tag == "a" and self._open_items:
+            href = ""
+            for key, value in attrs:
+                if key == "href":
+                    href = value or ""
+            record = AnchorRef(href)
+            self._open_anchors.append(record)
+            for li in self._open_items:
+                li.classify(record)
+        if tag in _NON_TEXT_CONTAINERS:
+            self._hidden_depth += 1
+        self._stack.append((tag, record))
+        self._open_counts[tag] = self._open_counts.get(tag, 0) + 1
+
+    def _pop_to(self, tag: str) -> None:
+        # BeautifulSoup gibi: açık değilse yok say, açıksa araya girenleri de kapat
+        if not self._open_counts.get(tag):
+            return
+        while self._stack:
+            if self._pop() == tag:
+                break
+
+    def _pop(self) -> str:
+        tag, record = self._stack.pop()
+        self._open_counts[tag] -= 1
+        if tag in _NON_TEXT_CONTAINERS:
+            self._hidden_depth -= 1
+        if record is None:
+            return tag
+        if tag == "a":
+            self._open_anchors.remove(record)
+        elif tag == "li":
+            self._open_items.remove(record)
+        elif tag == "ul":
+            self._open_lists.remove(record)
+            self._close_list(record)
+        return tag
+
+    def _close_list(self, ul: _List) -> None:
+        ul.closed = True
+        if len(ul.items) >= 2:
+            ul.item = build_item(ul.items, self.il_adi, self.ilce_adi, self.exclusions)
+        if ul.primary and not self.done:
+            self._check_complete()
+
+    def _check_complete(self) -> None:
+        """İlk `limit` eczane kesinleştiyse ayrıştırmayı bitir."""
+        lists = self._lists
+        while self._scan_index < len(lists):
+            ul = lists[self._scan_index]
+            if ul.primary:
+                if not ul.closed:
+                    return
+                if ul.item is not None and ul.item.name:
+                    self._found += 1
+                    if self._found >= self.limit:
+                        raise _StopParsing
+            self._scan_index += 1
+
+
+def parse_eczaneleri_net_html_stream(
+    html: str, limit: int, il_adi: str, ilce_adi: str
+) -> list[Pharmacy]:
+    """Tek geçişli parser ile eczane listesini çıkarır."""
+    parser = EczaneHTMLParser(limit, il_adi, ilce_adi)
+    parser.feed(html)
+    parser.close()
+    return parser.results()
@@ -0,0 +1,172 @@
+"""Nöbetçi eczane kaynakları (sağlayıcılar) ve hedge'li istek (Home Assistant bağımlılığı yok).
+
+Her sağlayıcı bir kaynaktan tek (il, ilçe) listesini çeker. Sağlayıcılar
+ölçülen gecikmelerinin üstel hareketli ortalamasına (EWMA) göre sıralanır;
+sıradaki, önceki HEDGE_DELAY içinde cevap vermezse veya hata verirse
+başlatılır ve ilk başarılı sonuç alınır (diğer istekler iptal edilir).
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .models import Pharmacy
+
+if TYPE_CHECKING:
+    from .api import FetchCache, FetchMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sıradaki sağlayıcıyı başlatmadan önce beklenen süre (saniye)
+HEDGE_DELAY = 3.0
+# Gecikme ortalamasında son ölçümün ağırlığı
+EWMA_ALPHA = 0.3
+
+
+@dataclass
+class ProviderStats:
+    """Sağlayıcı başına gecikme ortalaması ve başarı/hata sayaçları."""
+
+    ewma_ms: float | None = None
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+
+    def record_latency(self, seconds: float) -> None:
+        ms = seconds * 1000
+        if self.ewma_ms is None:
+            self.ewma_ms = ms
+        else:
+            self.ewma_ms += EWMA_ALPHA * (ms - self.ewma_ms)
+
+    def record_cancelled(self, seconds: float) -> None:
+        """İptal edilen istek: geçen süre gerçek gecikmenin alt sınırıdır, ortalamayı yalnızca artırabilir."""
+        ms = seconds * 1000
+        if self.ewma_ms is None or ms > self.ewma_ms:
+            self.ewma_ms = ms
+
+    def record_success(self, seconds: float) -> None:
+        self.record_latency(seconds)
+        self.successes += 1
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+
+
+class Provider(abc.ABC):
+    """Nöbetçi eczane kaynağı; alt sınıflar name ve async_fetch tanımlar."""
+
+    name = ""
+
+    def __init__(self) -> None:
+        self.stats = ProviderStats()
+
+    @abc.abstractmethod
+    async def async_fetch(
+        self,
+        session,
+        city: str,
+        district: str,
+        limit: int,
+        engine: str,
+        cache: FetchCache | None,
+        metrics: FetchMetrics | None,
+    ) -> list[Pharmacy]:
+        """Tek (il, ilçe) listesi; hata durumunda exception fırlatır."""
+
+
+# Kayıt sırası: gecikme bilinmeyen sağlayıcılar bu sırayla denenir
+_PROVIDERS: dict[str, Provider] = {}
+
+
+def register_provider(provider: Provider) -> None:
+    _PROVIDERS[provider.name] = provider
+
+
+def get_providers() -> list[Provider]:
+    return list(_PROVIDERS.values())
+
+
+def order_providers(providers: Sequence[Provider]) -> list[Provider]:
+    """Önce son isteği başarılı olanlar, sonra düşük gecikme ortalaması.
+
+    Gecikmesi henüz bilinmeyen sağlayıcı ölçülebilsin diye öne alınır; eşitlikte kayıt sırası.
+    """
+    return [
+        provider
+        for _, provider in sorted(
+            enumerate(providers),
+            key=lambda item: (
+                item[1].stats.consecutive_failures > 0,
+                item[1].stats.ewma_ms or 0.0,
+                item[0],
+            ),
+        )
+    ]
+
+
+async def _async_timed(
+    provider: Provider, fetch: Callable[[Provider], Awaitable[list[Pharmacy]]]
+) -> list[Pharmacy]:
+    start = time.perf_counter()
+    try:
+        result = await fetch(provider)
+    except asyncio.CancelledError:
+        # Başka sağlayıcı önce cevap verdi: kesik süre ortalamayı düşürmemeli
+        provider.stats.record_cancelled(time.perf_counter() - start)
+        raise
+    except Exception:
+        provider.stats.record_failure()
+        raise
+    provider.stats.record_success(time.perf_counter() - start)
+    return result
+
+
+async def async_fetch_hedged(
+    providers: Sequence[Provider],
+    fetch: Callable[[Provider], Awaitable[list[Pharmacy]]],
+    hedge_delay: float = HEDGE_DELAY,
+) -> list[Pharmacy]:
+    """İlk başarılı sağlayıcının sonucu; hepsi başarısızsa ilk alınan hata fırlatılır."""
+    remaining = order_providers(providers)
+    if len(remaining) == 1:
+        return await _async_timed(remaining[0], fetch)
+
+    pending: dict[asyncio.Task[list[Pharmacy]], Provider] = {}
+    errors: list[Exception] = []
+    try:
+        while remaining or pending:
+            if remaining:
+                provider = remaining.pop(0)
+                pending[asyncio.create_task(_async_timed(provider, fetch))] = provider
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=hedge_delay if remaining else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                _LOGGER.debug(
+                    "%s %.1f sn içinde cevap vermedi, sıradaki sağlayıcı başlatılıyor",
+                    ", ".join(p.name for p in pending.values()),
+                    hedge_delay,
+                )
+            for task in done:
+                provider = pending.pop(task)
+                err = task.exception()
+                if err is None:
+                    return task.result()
+                _LOGGER.debug("%s sağlayıcısı başarısız: %s", provider.name, err)
+                errors.append(err)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    raise errors[0]
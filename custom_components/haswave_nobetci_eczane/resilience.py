@@ -0,0 +1,234 @@
+"""Fetch katmanı için yeniden deneme ve devre kesici (Home Assistant bağımlılığı yok).
+
+Geçici hatalarda (bağlantı, zaman aşımı, 5xx/429) sınırlı sayıda, üstel artan
+ve rastgele sapmalı aralıklarla yeniden denenir. Aynı sunucuya art arda
+başarısız istekler devreyi açar; açıkken istek yapılmadan hata döner, süre
+dolunca tek bir deneme isteğine izin verilir. Sunucu başına token bucket,
+tüm entry'lerin (yeniden denemeler dahil) istek hızını sınırlar.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 8.0
+# Devrenin açılması için art arda başarısız istek sayısı
+BREAKER_FAILURE_THRESHOLD = 3
+# Açık devrenin deneme isteğine izin vermeden önce beklediği süre (saniye)
+BREAKER_RESET_TIMEOUT = 300.0
+# Sunucu başına istek sınırı: saniyede RATE_LIMIT_RATE istek, en fazla RATE_LIMIT_BURST ardışık
+RATE_LIMIT_RATE = 2.0
+RATE_LIMIT_BURST = 10
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Devre açık olduğu için istek yapılmadı."""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(f"{host} devresi açık, {retry_after:.0f} sn sonra denenecek")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def is_retryable(err: BaseException) -> bool:
+    """Yeniden denemeye değer geçici hata mı (bağlantı, zaman aşımı, 5xx, 429)."""
+    from aiohttp import ClientError, ClientResponseError
+
+    if isinstance(err, ClientResponseError):
+        return err.status >= 500 or err.status == 429
+    return isinstance(err, (ClientError, asyncio.TimeoutError, OSError))
+
+
+def backoff_delay(attempt: int, rng: random.Random | None = None) -> float:
+    """attempt. denemeden sonra beklenecek süre: üst sınırlı üstel artış + sapma."""
+    rng = rng or random
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+    return delay / 2 + rng.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """Tek bir sunucu için devre kesici."""
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return STATE_CLOSED
+        if self._clock() - self.opened_at >= self.reset_timeout:
+            return STATE_HALF_OPEN
+        return STATE_OPEN
+
+    def before_call(self) -> None:
+        """İstekten önce çağrılır; devre açıksa CircuitOpenError fırlatır."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return
+        if state == STATE_HALF_OPEN and not self._trial:
+            self._trial = True
+            return
+        retry_after = max(0.0, self.opened_at + self.reset_timeout - self._clock())
+        raise CircuitOpenError(self.host, retry_after)
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            _LOGGER.info("%s yeniden erişilebilir, devre kapandı", self.host)
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def release(self) -> None:
+        """İptal edilen deneme isteğinin hakkını geri ver."""
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial or (self.opened_at is None and self.failures >= self.failure_threshold):
+            if self.opened_at is None:
+                _LOGGER.warning(
+                    "%s art arda %s kez başarısız, istekler %.0f sn durduruldu",
+                    self.host,
+                    self.failures,
+                    self.reset_timeout,
+                )
+            self.opened_at = self._clock()
+        self._trial = False
+
+
+class TokenBucket:
+    """Tek bir sunucu için istek hızı sınırı; token yoksa acquire bekler."""
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = RATE_LIMIT_RATE,
+        burst: int = RATE_LIMIT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self.tokens = float(burst)
+        self._updated = clock()
+        # Bekleyen istek sayısı ve toplam bekleme (saniye)
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Token alınabildiyse 0, alınamadıysa gereken bekleme süresi (saniye)."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.try_acquire()
+        if not delay:
+            return
+        self.waits += 1
+        _LOGGER.debug("%s istek sınırı: %.2f sn bekleniyor", self.host, delay)
+        while delay:
+            self.waited_seconds += delay
+            await asyncio.sleep(delay)
+            # Bekleyen başka istekler token'ı önce almış olabilir
+            delay = self.try_acquire()
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_LIMITERS: dict[str, TokenBucket] = {}
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Sunucu başına paylaşılan devre kesici."""
+    breaker = _BREAKERS.get(host)
+    if breaker is None:
+        breaker = _BREAKERS[host] = CircuitBreaker(host)
+    return breaker
+
+
+def get_rate_limiter(host: str) -> TokenBucket:
+    """Sunucu başına paylaşılan istek hızı sınırı."""
+    limiter = _LIMITERS.get(host)
+    if limiter is None:
+        limiter = _LIMITERS[host] = TokenBucket(host)
+    return limiter
+
+
+async def async_call_with_retry(
+    func: Callable[[], Awaitable[_T]],
+    breaker: CircuitBreaker,
+    attempts: int = RETRY_ATTEMPTS,
+    rng: random.Random | None = None,
+    limiter: TokenBucket | None = None,
+) -> _T:
+    """
+    func'u devre kesici (ve varsa istek sınırı) üzerinden çağırır; geçici
+    hatalarda en fazla `attempts` kez dener. Kalıcı hatalar (4xx, parse) hemen
+    yükseltilir.
+    """
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            if limiter is not None:
+                await limiter.acquire()
+            result = await func()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as err:
+            if not is_retryable(err):
+                # Sunucu yanıt verdi; hata isteğe/içeriğe ait
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            attempt += 1
+            if attempt >= attempts:
+                raise
+            delay = backoff_delay(attempt - 1, rng)
+            _LOGGER.debug(
+                "%s isteği başarısız (%s), %.1f sn sonra tekrar denenecek (%s/%s)",
+                breaker.host,
+                err,
+                delay,
+                attempt + 1,
+                attempts,
+            )
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
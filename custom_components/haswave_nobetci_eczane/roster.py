@@ -0,0 +1,76 @@
+"""Nöbet listesi için ilçe ve eczane adı indeksi (Home Assistant bağımlılığı yok)."""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+from .catalog import ascii_fold
+from .models import Pharmacy
+from .util import tr_casefold
+
+# "... NO:5 ÇORLU/TEKİRDAĞ" veya "Çorlu - Tekirdağ" biçimindeki adres sonları
+_DISTRICT_BEFORE_CITY = r"([^\W\d_]+)\s*[/-]\s*{city}\b"
+
+
+def district_from_address(address: str, city: str) -> str:
+    """İl geneli listelerde ilçeyi adresteki "İLÇE / İL" kalıbından çıkarır (casefold)."""
+    folded_city = tr_casefold(city)
+    if not address or not folded_city:
+        return ""
+    matches = re.findall(
+        _DISTRICT_BEFORE_CITY.format(city=re.escape(folded_city)), tr_casefold(address)
+    )
+    return matches[-1] if matches else ""
+
+
+class RosterIndex:
+    """Bir liste için bir kez kurulan arama indeksi.
+
+    İlçe ve tam eczane adı sorguları sözlükten O(1) yanıtlanır; ad parçası
+    sorgularında sadece önceden normalize edilmiş adlar taranır. Anahtarlar
+    katalogdaki gibi ascii_fold ile normalize edilir ("kapakli" = "KAPAKLI" =
+    "Kapaklı"); sonuçlarda ilçe Türkçe yazımıyla (casefold) döner.
+    """
+
+    __slots__ = ("city", "by_district", "by_name", "_entries")
+
+    def __init__(self, city: str, pharmacies: Iterable[Pharmacy]) -> None:
+        self.city = tr_casefold(city)
+        self.by_district: dict[str, list[tuple[str, Pharmacy]]] = {}
+        self.by_name: dict[str, list[tuple[str, Pharmacy]]] = {}
+        # (normalize ad, normalize ilçe, casefold ilçe, eczane), liste sırasıyla
+        self._entries: list[tuple[str, str, str, Pharmacy]] = []
+        for pharmacy in pharmacies:
+            district = self.district_of(pharmacy)
+            district_key = ascii_fold(district)
+            name = ascii_fold(pharmacy.name)
+            self.by_district.setdefault(district_key, []).append((district, pharmacy))
+            self.by_name.setdefault(name, []).append((district, pharmacy))
+            self._entries.append((name, district_key, district, pharmacy))
+
+    def district_of(self, pharmacy: Pharmacy) -> str:
+        county = tr_casefold(pharmacy.county)
+        if county and county != tr_casefold(pharmacy.city):
+            return county
+        return district_from_address(pharmacy.address, pharmacy.city)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(
+        self, district: str | None = None, name: str | None = None
+    ) -> list[tuple[str, Pharmacy]]:
+        """(ilçe, eczane) eşleşmeleri; boş kriter filtre uygulamaz."""
+        district_key = ascii_fold(district)
+        name_key = ascii_fold(name)
+        if name_key and name_key in self.by_name:
+            candidates = list(self.by_name[name_key])
+        elif name_key:
+            candidates = [(d, p) for n, _, d, p in self._entries if name_key in n]
+        elif district_key:
+            return list(self.by_district.get(district_key, ()))
+        else:
+            candidates = [(d, p) for _, _, d, p in self._entries]
+        if district_key:
+            candidates = [(d, p) for d, p in candidates if ascii_fold(d) == district_key]
+        return candidates
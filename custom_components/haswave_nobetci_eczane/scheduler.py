@@ -0,0 +1,74 @@
+"""Nöbet günü sınırına göre yenileme zamanlaması (Home Assistant bağımlılığı yok).
+
+Nöbet listesi her sabah 08:30 civarında değişir. Değişim penceresinde sık
+denenir, yeni liste görülünce bir sonraki pencereye kadar beklenir. Pencere
+yeni liste görülmeden geçerse gün boyunca saatlik denenir. Çok sayıda
+entry aynı saniyede istek atmasın diye her gecikmeye rastgele sapma eklenir.
+"""
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+# Türkiye 2016'dan beri sabit UTC+3 (yaz saati yok)
+TR_TZ = timezone(timedelta(hours=3), "TRT")
+DUTY_CHANGEOVER = time(8, 30)
+# Değişim penceresi: 08:00 - 10:00 arası sık deneme
+WINDOW_START = time(8, 0)
+WINDOW_END = time(10, 0)
+RETRY_INTERVAL = timedelta(minutes=5)
+RETRY_JITTER = timedelta(seconds=30)
+# Pencere yeni liste görülmeden geçtiyse (site geç güncelledi, kaynak erişilemedi,
+# HA pencereden sonra açıldı) değişim görülene kadar bu aralıkla denenir
+LATE_RETRY_INTERVAL = timedelta(hours=1)
+SLEEP_JITTER = timedelta(minutes=2)
+
+
+def duty_day(now: datetime) -> date:
+    """Verilen anda geçerli olan nöbet günü (08:30'dan önce bir önceki gün)."""
+    local = now.astimezone(TR_TZ)
+    if local.time() < DUTY_CHANGEOVER:
+        return local.date() - timedelta(days=1)
+    return local.date()
+
+
+def in_changeover_window(now: datetime) -> bool:
+    local = now.astimezone(TR_TZ)
+    return WINDOW_START <= local.time() < WINDOW_END
+
+
+def awaiting_changeover(now: datetime, changed_on: date | None) -> bool:
+    """Bugünün penceresi başladı ama değişmiş liste henüz görülmedi mi?"""
+    local = now.astimezone(TR_TZ)
+    return local.time() >= WINDOW_START and changed_on != local.date()
+
+
+def window_start(now: datetime) -> datetime:
+    """Verilen günün (yerel) değişim penceresinin başlangıcı."""
+    return datetime.combine(now.astimezone(TR_TZ).date(), WINDOW_START, TR_TZ)
+
+
+def next_refresh_delay(
+    now: datetime,
+    changed_on: date | None,
+    rng: random.Random | None = None,
+) -> timedelta:
+    """Bir sonraki yenilemeye kadar beklenecek süre.
+
+    changed_on: değişmiş listenin en son görüldüğü (yerel) tarih. Bugün henüz
+    yeni liste görülmediyse pencere içinde kısa, pencereden sonra saatlik
+    aralıkla denenir; gece yarısından sonra bir sonraki pencere beklenir.
+    """
+    rng = rng or random
+    local = now.astimezone(TR_TZ)
+    if awaiting_changeover(local, changed_on):
+        if in_changeover_window(local):
+            return RETRY_INTERVAL + timedelta(seconds=rng.uniform(0, RETRY_JITTER.total_seconds()))
+        return LATE_RETRY_INTERVAL + timedelta(
+            seconds=rng.uniform(0, SLEEP_JITTER.total_seconds())
+        )
+
+    target = datetime.combine(local.date(), WINDOW_START, TR_TZ)
+    if local >= target:
+        target += timedelta(days=1)
+    return (target - local) + timedelta(seconds=rng.uniform(0, SLEEP_JITTER.total_seconds()))
@@ -2,40 +2,148 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .api import FetchMetrics
+from .const import (
+    COORDINATOR_CONTEXT_DIAGNOSTIC,
+    DEFAULT_ENTITY_MODE,
+    DEFAULT_TRACKED_ENTITY,
+    DOMAIN,
+    ENTITY_MODE_ROSTER,
+    NEAREST_MOVE_THRESHOLD_M,
+)
+from .coordinator import EczaneDataUpdateCoordinator
+from .geo import GeoIndex, haversine_m
+from .models import Pharmacy
+from .util import format_phone_number  # noqa: F401  (geriye dönük uyumluluk)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Liste sensor'ında her eczane bu sırayla tek bir dizi olarak tutulur
+ROSTER_FIELDS = ("name", "phone", "address", "map_link")
+# İlçe başına sıra sensor'larının en fazla sayısı (mod değişince registry'den silinir)
+MAX_SLOTS = 20
+
+
+@dataclass(frozen=True, kw_only=True)
+class EczaneDiagnosticSensorDescription(SensorEntityDescription):
+    """Fetch sayaçlarından (FetchMetrics) değer okuyan diagnostic sensor tanımı."""
+
+    value_fn: Callable[[FetchMetrics], float | int | datetime | None]
+    attrs_fn: Callable[[FetchMetrics], dict[str, Any]] | None = None
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    return None if value is None else round(value, digits)
 
-def format_phone_number(phone: str) -> str:
-    """Format phone number."""
-    if not phone:
-        return phone
-    
-    digits = ''.join(filter(str.isdigit, phone))
-    
-    if not digits:
-        return phone
-    
-    if len(digits) == 12 and digits.startswith('90'):
-        digits = '0' + digits[2:]
-    
-    if len(digits) == 11:
-        if digits.startswith('05'):
-            return f"{digits[:4]} {digits[4:7]} {digits[7:]}"
-        elif digits.startswith('0'):
-            return f"{digits[:4]} {digits[4:7]} {digits[7:]}"
-    
-    return phone
+
+DIAGNOSTIC_SENSORS: tuple[EczaneDiagnosticSensorDescription, ...] = (
+    EczaneDiagnosticSensorDescription(
+        key="fetch_latency",
+        name="Fetch Süresi",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _round(m.last_latency_ms, 1),
+    ),
+    EczaneDiagnosticSensorDescription(
+        key="response_size",
+        name="Yanıt Boyutu",
+        icon="mdi:download-network-outline",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.last_bytes,
+        attrs_fn=lambda m: {"bytes_total": m.bytes_total},
+    ),
+    EczaneDiagnosticSensorDescription(
+        key="compression_saved",
+        name="Sıkıştırma Kazancı",
+        icon="mdi:zip-box-outline",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda m: m.bytes_saved,
+        attrs_fn=lambda m: {"bytes_wire": m.bytes_wire},
+    ),
+    EczaneDiagnosticSensorDescription(
+        key="parse_time",
+        name="Parse Süresi",
+        icon="mdi:code-tags",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: round(m.last_parse_ms, 2),
+    ),
+    EczaneDiagnosticSensorDescription(
+        key="pharmacy_count",
+        name="Çekilen Eczane Sayısı",
+        icon="mdi:counter",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.last_count,
+        attrs_fn=lambda m: {"zero_results": m.zero_results},
+    ),
+    EczaneDiagnosticSensorDescription(
+        key="consecutive_failures",
+        name="Ardışık Hata",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.consecutive_failures,
+        attrs_fn=lambda m: {
+            "failures": m.failures,
+            "fetches": m.fetches,
+            "last_error": m.last_error,
+        },
+    ),
+    EczaneDiagnosticSensorDescription(
+        key="last_success",
+        name="Son Başarılı Fetch",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda m: m.last_success,
+    ),
+    EczaneDiagnosticSensorDescription(
+        key="cache_hit_ratio",
+        name="Önbellek İsabet Oranı",
+        icon="mdi:cached",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _round(
+            m.cache_hit_ratio * 100 if m.cache_hit_ratio is not None else None, 1
+        ),
+        attrs_fn=lambda m: {
+            "cache_hits": m.cache_hits,
+            "responses": m.responses,
+            "requests": m.requests,
+        },
+    ),
+)
 
 
 async def async_setup_entry(
@@ -44,7 +152,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    coordinator: EczaneDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     sensor_count = hass.data[DOMAIN][entry.entry_id].get("sensor_count", 5)
     
     entities = []
@@ -54,78 +162,300 @@ async def async_setup_entry(
         name=entry.title or "Nöbetçi Eczane",
         manufacturer="HasWave",
     )
-    for i in range(1, sensor_count + 1):
-        entities.append(HasWaveEczaneSensor(coordinator, entry.entry_id, i, device_info))
+    roster_mode = (
+        hass.data[DOMAIN][entry.entry_id].get("entity_mode", DEFAULT_ENTITY_MODE)
+        == ENTITY_MODE_ROSTER
+    )
+    # Çok ilçeli entry'lerde sensor sayısı ilçe başına uygulanır
+    district_count = max(1, len(coordinator.api.districts))
+    _async_remove_other_mode(hass, entry.entry_id, roster_mode, district_count)
+    if roster_mode:
+        entities.append(
+            HasWaveEczaneRosterSensor(coordinator, entry.entry_id, sensor_count, device_info)
+        )
+    else:
+        for i in range(1, sensor_count * district_count + 1):
+            entities.append(
+                HasWaveEczaneSensor(coordinator, entry.entry_id, sensor_count, i, device_info)
+            )
+    entities.append(
+        HasWaveNearestEczaneSensor(
+            coordinator,
+            entry.entry_id,
+            device_info,
+            hass.data[DOMAIN][entry.entry_id].get("tracked_entity", DEFAULT_TRACKED_ENTITY),
+        )
+    )
+    entities.extend(
+        HasWaveEczaneDiagnosticSensor(coordinator, entry.entry_id, device_info, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
     async_add_entities(entities)
 
 
-class HasWaveEczaneSensor(CoordinatorEntity, SensorEntity):
+@callback
+def _async_remove_other_mode(
+    hass: HomeAssistant, entry_id: str, roster_mode: bool, district_count: int
+) -> None:
+    """Entity modu değiştiyse diğer modun sensor'larını registry'den kaldır."""
+    registry = er.async_get(hass)
+    if roster_mode:
+        unique_ids = [
+            f"{DOMAIN}_{entry_id}_{i}" for i in range(1, MAX_SLOTS * district_count + 1)
+        ]
+    else:
+        unique_ids = [f"{DOMAIN}_{entry_id}_roster"]
+    for unique_id in unique_ids:
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+        if entity_id is not None:
+            registry.async_remove(entity_id)
+
+
+class HasWaveEczaneSensor(CoordinatorEntity[EczaneDataUpdateCoordinator], SensorEntity):
     """Representation of a pharmacy sensor."""
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EczaneDataUpdateCoordinator,
         entry_id: str,
+        limit: int,
         index: int,
         device_info: DeviceInfo,
     ) -> None:
         super().__init__(coordinator)
+        self._limit = limit
         self._index = index
         self._attr_unique_id = f"{DOMAIN}_{entry_id}_{index}"
         self._attr_name = f"Nöbetçi Eczane {index}"
         self._attr_icon = "mdi:stethoscope"
         self._attr_device_info = device_info
+        # Son yazılan durumun parmak izi; değişmeyen sıra yeniden yazılmaz
+        self._fingerprint: tuple[Any, ...] | None = None
+    
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._fingerprint = self._current_fingerprint()
+    
+    def _current_fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.coordinator.slot(self._limit, self._index).fingerprint)
+    
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Sadece bu sıradaki eczane (veya erişilebilirlik) değiştiyse durumu yaz."""
+        fingerprint = self._current_fingerprint()
+        if fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
+        self.async_write_ha_state()
     
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        if self.coordinator.data is None:
-            _LOGGER.debug(f"Eczane sensor {self._index}: Coordinator data is None")
-            return None
-        
-        pharmacies = self.coordinator.data
-        _LOGGER.debug(f"Eczane sensor {self._index}: {len(pharmacies)} eczane bulundu")
-        
         # Veri yoksa None döndür (sensor unavailable olur)
-        if self._index > len(pharmacies):
-            return None
-        
-        name = pharmacies[self._index - 1].get("name")
-        if not name:
-            return None
-        
-        _LOGGER.debug(f"Eczane sensor {self._index}: {name}")
-        return name
+        return self.coordinator.slot(self._limit, self._index).name
     
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        if self.coordinator.data is None:
-            return {}
-        
-        pharmacies = self.coordinator.data
-        
-        # Veri yoksa boş attributes döndür
-        if self._index > len(pharmacies):
-            return {}
-        
-        pharmacy = pharmacies[self._index - 1]
-        if not pharmacy:
-            return {}
-        
-        attributes = {}
-        
-        phone = pharmacy.get("phone")
-        if phone:
-            attributes["phone"] = format_phone_number(phone)
-        
-        address = pharmacy.get("address")
-        if address:
-            attributes["address"] = address
-        
-        map_link = pharmacy.get("map_link")
-        if map_link:
-            attributes["map_link"] = map_link
-        
+        # Koordinatör her yenilemede bir kez hesaplar
+        return self.coordinator.slot(self._limit, self._index).attributes
+
+
+class HasWaveEczaneRosterSensor(CoordinatorEntity[EczaneDataUpdateCoordinator], SensorEntity):
+    """Tüm sıralı liste tek sensor'da: durum eczane sayısı, liste `pharmacies` attribute'u.
+
+    Her eczane ROSTER_FIELDS sırasıyla bir dizidir. Liste recorder'a yazılmaz;
+    durum yalnızca liste (veya eskilik) değiştiğinde yazılır.
+    """
+
+    _unrecorded_attributes = frozenset({"fields", "pharmacies"})
+
+    def __init__(
+        self,
+        coordinator: EczaneDataUpdateCoordinator,
+        entry_id: str,
+        limit: int,
+        device_info: DeviceInfo,
+    ) -> None:
+        super().__init__(coordinator)
+        self._limit = limit
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_roster"
+        self._attr_name = "Nöbetçi Eczane Listesi"
+        self._attr_icon = "mdi:format-list-numbered"
+        self._attr_device_info = device_info
+        self._fingerprint: tuple[Any, ...] | None = None
+        self._update_from_coordinator()
+
+    def _current_fingerprint(self) -> tuple[Any, ...]:
+        return (
+            self.available,
+            tuple(self.coordinator.data_for(self._limit)),
+            tuple(self.coordinator.stale_attributes().items()),
+        )
+
+    def _update_from_coordinator(self) -> bool:
+        """Liste değiştiyse durum ve attribute'ları yeniden kur; değiştiyse True."""
+        fingerprint = self._current_fingerprint()
+        if fingerprint == self._fingerprint:
+            return False
+        self._fingerprint = fingerprint
+        _, pharmacies, extra = fingerprint
+        self._attr_native_value = len(pharmacies)
+        self._attr_extra_state_attributes = {
+            "fields": list(ROSTER_FIELDS),
+            "pharmacies": [
+                [pharmacy.name, pharmacy.phone_formatted, pharmacy.address, pharmacy.map_link]
+                for pharmacy in pharmacies
+            ],
+            **dict(extra),
+        }
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._update_from_coordinator():
+            self.async_write_ha_state()
+
+
+class HasWaveNearestEczaneSensor(CoordinatorEntity[EczaneDataUpdateCoordinator], SensorEntity):
+    """İzlenen konuma (varsayılan zone.home) en yakın nöbetçi eczane.
+
+    Liste değişmedikçe ve konum NEAREST_MOVE_THRESHOLD_M'den az oynadıkça
+    yeniden hesaplanmaz; koordinatların çıkarıldığı indeks liste başına bir kez kurulur.
+    """
+
+    def __init__(
+        self,
+        coordinator: EczaneDataUpdateCoordinator,
+        entry_id: str,
+        device_info: DeviceInfo,
+        tracked_entity: str,
+    ) -> None:
+        super().__init__(coordinator)
+        self._tracked_entity = tracked_entity
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_nearest"
+        self._attr_name = "En Yakın Nöbetçi Eczane"
+        self._attr_icon = "mdi:map-marker-distance"
+        self._attr_device_info = device_info
+        # Son hesaplamanın girdileri ve sonucu
+        self._index: GeoIndex | None = None
+        self._origin: tuple[float, float] | None = None
+        self._nearest: tuple[Pharmacy, float] | None = None
+        self._fingerprint: tuple[Any, ...] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass, [self._tracked_entity], self._handle_tracked_update
+            )
+        )
+        self._recompute()
+        self._fingerprint = self._current_fingerprint()
+
+    def _tracked_location(self) -> tuple[float, float] | None:
+        state = self.hass.states.get(self._tracked_entity)
+        if state is not None:
+            lat = state.attributes.get(ATTR_LATITUDE)
+            lon = state.attributes.get(ATTR_LONGITUDE)
+            if lat is not None and lon is not None:
+                return float(lat), float(lon)
+            return None
+        if self._tracked_entity == DEFAULT_TRACKED_ENTITY:
+            return self.hass.config.latitude, self.hass.config.longitude
+        return None
+
+    def _recompute(self) -> None:
+        """Liste veya konum (eşikten fazla) değiştiyse en yakın eczaneyi yeniden bul."""
+        index = self.coordinator.geo_index
+        origin = self._tracked_location()
+        if origin is None:
+            self._index, self._origin, self._nearest = index, None, None
+            return
+        if (
+            index is self._index
+            and self._origin is not None
+            and haversine_m(*origin, *self._origin) < NEAREST_MOVE_THRESHOLD_M
+        ):
+            return
+        self._index, self._origin = index, origin
+        self._nearest = index.nearest(*origin)
+
+    def _current_fingerprint(self) -> tuple[Any, ...]:
+        if self._nearest is None:
+            return (self.available, None, None)
+        pharmacy, distance = self._nearest
+        return (self.available, pharmacy, round(distance))
+
+    @callback
+    def _write_if_changed(self) -> None:
+        fingerprint = self._current_fingerprint()
+        if fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._recompute()
+        self._write_if_changed()
+
+    @callback
+    def _handle_tracked_update(self, event: Event) -> None:
+        self._recompute()
+        self._write_if_changed()
+
+    @property
+    def native_value(self) -> str | None:
+        if self._nearest is None:
+            return None
+        return self._nearest[0].name or None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        attributes: dict[str, Any] = {"tracked_entity": self._tracked_entity}
+        if self._nearest is None:
+            return attributes
+        pharmacy, distance = self._nearest
+        attributes["distance_km"] = round(distance / 1000, 2)
+        if pharmacy.phone:
+            attributes["phone"] = pharmacy.phone_formatted
+        if pharmacy.address:
+            attributes["address"] = pharmacy.address
+        if pharmacy.map_link:
+            attributes["map_link"] = pharmacy.map_link
         return attributes
 
+
+class HasWaveEczaneDiagnosticSensor(CoordinatorEntity[EczaneDataUpdateCoordinator], SensorEntity):
+    """Koordinatörün fetch/parse sayaçlarından biri (varsayılan olarak kapalı).
+
+    Liste değişmese de her yenilemede bildirim alır (COORDINATOR_CONTEXT_DIAGNOSTIC).
+    """
+
+    entity_description: EczaneDiagnosticSensorDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: EczaneDataUpdateCoordinator,
+        entry_id: str,
+        device_info: DeviceInfo,
+        description: EczaneDiagnosticSensorDescription,
+    ) -> None:
+        super().__init__(coordinator, context=COORDINATOR_CONTEXT_DIAGNOSTIC)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{description.key}"
+        self._attr_name = f"Nöbetçi Eczane {description.name}"
+        self._attr_device_info = device_info
+
+    @property
+    def native_value(self) -> float | int | datetime | None:
+        return self.entity_description.value_fn(self.coordinator.api.metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if self.entity_description.attrs_fn is None:
+            return None
+        return self.entity_description.attrs_fn(self.coordinator.api.metrics)
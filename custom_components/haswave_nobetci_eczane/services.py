@@ -0,0 +1,158 @@
+"""HasWave Nöbetçi Eczane servisleri."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .catalog import ascii_fold
+from .const import DATA_COORDINATORS, DOMAIN
+from .history import async_get_history
+from .scheduler import duty_day
+from .util import location_key
+
+SERVICE_SEARCH = "search"
+SERVICE_HISTORY = "history"
+SERVICE_REFRESH = "refresh"
+ATTR_CITY = "city"
+ATTR_DISTRICT = "district"
+ATTR_NAME = "name"
+ATTR_LIMIT = "limit"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+# Başlangıç verilmezse bitişten geriye bu kadar gün
+DEFAULT_HISTORY_DAYS = 30
+
+SEARCH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CITY): cv.string,
+        vol.Optional(ATTR_DISTRICT): cv.string,
+        vol.Optional(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_LIMIT, default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    }
+)
+
+HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CITY): cv.string,
+        vol.Optional(ATTR_DISTRICT): cv.string,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CITY): cv.string,
+        vol.Optional(ATTR_DISTRICT): cv.string,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Entegrasyon servislerini kaydet (bir kez)."""
+    if hass.services.has_service(DOMAIN, SERVICE_SEARCH):
+        return
+
+    async def _async_search(call: ServiceCall) -> ServiceResponse:
+        """Kurulu entry'lerin mevcut listelerinde ara (yeni istek yapılmaz)."""
+        city = ascii_fold(call.data.get(ATTR_CITY))
+        limit = call.data[ATTR_LIMIT]
+        registry = hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {})
+        matches: list[dict[str, Any]] = []
+        seen: set[Any] = set()
+        for (city_key, _), coordinator in registry.items():
+            if city and ascii_fold(city_key) != city:
+                continue
+            for district, pharmacy in coordinator.roster_index.search(
+                call.data.get(ATTR_DISTRICT), call.data.get(ATTR_NAME)
+            ):
+                if pharmacy in seen:
+                    continue
+                seen.add(pharmacy)
+                matches.append({**pharmacy.as_dict(), "district": district})
+                if len(matches) >= limit:
+                    return {"pharmacies": matches}
+        return {"pharmacies": matches}
+
+    async def _async_history(call: ServiceCall) -> ServiceResponse:
+        """Kaydedilmiş nöbet listeleri (nöbet günü aralığı, her iki uç dahil)."""
+        end = call.data.get(ATTR_END_DATE) or duty_day(dt_util.utcnow())
+        start = call.data.get(ATTR_START_DATE) or end - timedelta(days=DEFAULT_HISTORY_DAYS)
+        if start > end:
+            raise ServiceValidationError(
+                f"Başlangıç tarihi ({start}) bitiş tarihinden ({end}) sonra olamaz"
+            )
+        city = call.data.get(ATTR_CITY)
+        district = call.data.get(ATTR_DISTRICT)
+        city_key, county_key = location_key(city, district) if city else (None, None)
+        history = await async_get_history(hass)
+        rows = await history.async_query(city_key, county_key if district else None, start, end)
+        return {
+            "days": [
+                {
+                    "city": row_city,
+                    "county": row_county,
+                    "duty_day": day,
+                    "pharmacies": [pharmacy.as_dict() for pharmacy in pharmacies],
+                }
+                for row_city, row_county, day, pharmacies in rows
+            ]
+        }
+
+    async def _async_refresh(call: ServiceCall) -> ServiceResponse:
+        """Eşleşen konumları yenile (devam eden fetch'e katılır, yeni veride istek yapılmaz)."""
+        city = call.data.get(ATTR_CITY)
+        district = call.data.get(ATTR_DISTRICT)
+        wanted = location_key(city, district) if city else None
+        registry = hass.data.get(DOMAIN, {}).get(DATA_COORDINATORS, {})
+        coordinators = [
+            coordinator
+            for key, coordinator in registry.items()
+            if wanted is None or key == wanted or (not district and key[0] == wanted[0])
+        ]
+        refreshed = await asyncio.gather(
+            *(coordinator.async_manual_refresh() for coordinator in coordinators)
+        )
+        return {
+            "locations": [
+                {
+                    "city": coordinator.key[0],
+                    "county": coordinator.key[1],
+                    "refreshed": fetched,
+                    "last_update_success": coordinator.last_update_success,
+                    "stale": coordinator.stale,
+                    "pharmacies": len(coordinator.data or []),
+                }
+                for coordinator, fetched in zip(coordinators, refreshed)
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH,
+        _async_search,
+        schema=SEARCH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_HISTORY,
+        _async_history,
+        schema=HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        _async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
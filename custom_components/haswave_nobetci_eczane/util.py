@@ -0,0 +1,58 @@
+"""HasWave Nöbetçi Eczane yardımcı fonksiyonları (Home Assistant bağımlılığı yok)."""
+from __future__ import annotations
+
+# Türkçe büyük/küçük harf dönüşümünde str.casefold yetersiz kalır (İ -> i̇, I -> i)
+_TR_FOLD_TABLE = str.maketrans({"İ": "i", "I": "ı"})
+
+
+def tr_casefold(value: str | None) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir ve boşlukları sadeleştirir."""
+    if not value:
+        return ""
+    return " ".join(value.translate(_TR_FOLD_TABLE).lower().split())
+
+
+def split_districts(district: str | None) -> list[str]:
+    """Virgülle ayrılmış ilçe listesini (sırayı koruyarak, tekrarsız) böler."""
+    seen: set[str] = set()
+    districts: list[str] = []
+    for part in (district or "").split(","):
+        name = part.strip()
+        if name and tr_casefold(name) not in seen:
+            seen.add(tr_casefold(name))
+            districts.append(name)
+    return districts
+
+
+def location_key(city: str | None, district: str | None = "") -> tuple[str, str]:
+    """(il, ilçe) çiftini karşılaştırılabilir anahtara çevirir; boş ilçe il olarak kabul edilir.
+
+    Çok ilçeli girişlerde ilçeler yazıldıkları sırayla "+" ile birleştirilir: birleşik
+    liste bu sırayı izlediğinden farklı sıralı entry'ler koordinatör paylaşmaz.
+    """
+    city_key = tr_casefold(city)
+    counties = [tr_casefold(name) for name in split_districts(district)]
+    county_key = "+".join(counties) or city_key
+    return city_key, county_key
+
+
+def format_phone_number(phone: str) -> str:
+    """Format phone number."""
+    if not phone:
+        return phone
+
+    digits = "".join(filter(str.isdigit, phone))
+
+    if not digits:
+        return phone
+
+    if len(digits) == 12 and digits.startswith("90"):
+        digits = "0" + digits[2:]
+
+    if len(digits) == 11:
+        if digits.startswith("05"):
+            return f"{digits[:4]} {digits[4:7]} {digits[7:]}"
+        elif digits.startswith("0"):
+            return f"{digits[:4]} {digits[4:7]} {digits[7:]}"
+
+    return phone
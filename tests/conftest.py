@@ -0,0 +1,5 @@
+"""Testler için depo kökünü import yoluna ekler (custom_components paketi)."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
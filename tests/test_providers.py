@@ -0,0 +1,138 @@
+"""Hedge'li sağlayıcı isteği (providers.async_fetch_hedged) testleri."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.haswave_nobetci_eczane.models import Pharmacy
+from custom_components.haswave_nobetci_eczane.providers import (
+    Provider,
+    ProviderStats,
+    async_fetch_hedged,
+    order_providers,
+)
+
+PHARMACY = Pharmacy.create("A ECZANESİ", "ADRES", "02820000000", "", "TEKİRDAĞ", "ÇORLU")
+
+
+class FakeProvider(Provider):
+    def __init__(self, name: str, delay: float = 0.0, error: Exception | None = None) -> None:
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def async_fetch(self, session, city, district, limit, engine, cache, metrics):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return [PHARMACY]
+
+
+def _fetch(provider: Provider):
+    return provider.async_fetch(None, "TEKİRDAĞ", "ÇORLU", 5, "stream", None, None)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_provider_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        Provider()  # type: ignore[abstract]
+
+
+def test_single_provider_is_called_directly() -> None:
+    fast = FakeProvider("fast")
+    assert _run(async_fetch_hedged([fast], _fetch, hedge_delay=0.01)) == [PHARMACY]
+    assert fast.calls == 1
+    assert fast.stats.successes == 1
+
+
+def test_hedge_delay_starts_next_provider_and_winner_cancels_loser() -> None:
+    slow = FakeProvider("slow", delay=5.0)
+    fast = FakeProvider("fast", delay=0.0)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await async_fetch_hedged([slow, fast], _fetch, hedge_delay=0.05)
+        return result, loop.time() - start
+
+    result, elapsed = _run(run())
+    assert result == [PHARMACY]
+    assert elapsed < 1.0
+    assert slow.calls == 1 and fast.calls == 1
+    assert slow.cancelled
+    assert fast.stats.successes == 1
+    assert slow.stats.successes == 0 and slow.stats.failures == 0
+    # İptal edilen istek en az hedge süresi kadar sürdü
+    assert slow.stats.ewma_ms is not None and slow.stats.ewma_ms >= 50
+
+
+def test_fast_first_provider_does_not_start_hedge() -> None:
+    fast = FakeProvider("fast", delay=0.0)
+    other = FakeProvider("other", delay=0.0)
+    assert _run(async_fetch_hedged([fast, other], _fetch, hedge_delay=1.0)) == [PHARMACY]
+    assert other.calls == 0
+
+
+def test_failure_starts_next_provider_without_waiting() -> None:
+    broken = FakeProvider("broken", error=RuntimeError("down"))
+    backup = FakeProvider("backup")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await async_fetch_hedged([broken, backup], _fetch, hedge_delay=5.0)
+        return result, loop.time() - start
+
+    result, elapsed = _run(run())
+    assert result == [PHARMACY]
+    assert elapsed < 1.0
+    assert broken.stats.consecutive_failures == 1
+
+
+def test_all_providers_failing_raises_first_error() -> None:
+    first = FakeProvider("first", error=RuntimeError("first"))
+    second = FakeProvider("second", delay=0.01, error=ValueError("second"))
+    with pytest.raises(RuntimeError, match="first"):
+        _run(async_fetch_hedged([first, second], _fetch, hedge_delay=0.01))
+    assert first.stats.failures == 1 and second.stats.failures == 1
+
+
+def test_ewma_reorders_providers() -> None:
+    slow = FakeProvider("slow", delay=5.0)
+    fast = FakeProvider("fast")
+    assert order_providers([slow, fast]) == [slow, fast]
+    _run(async_fetch_hedged([slow, fast], _fetch, hedge_delay=0.05))
+    assert order_providers([slow, fast]) == [fast, slow]
+    # Sonraki istekte hızlı sağlayıcı önce denenir, yavaşı hiç başlatılmaz
+    _run(async_fetch_hedged([slow, fast], _fetch, hedge_delay=1.0))
+    assert slow.calls == 1 and fast.calls == 2
+
+
+def test_failing_provider_is_ordered_last() -> None:
+    good = FakeProvider("good")
+    bad = FakeProvider("bad")
+    good.stats.record_success(0.5)
+    bad.stats.record_success(0.01)
+    bad.stats.record_failure()
+    assert order_providers([bad, good]) == [good, bad]
+
+
+def test_cancelled_latency_only_raises_ewma() -> None:
+    stats = ProviderStats()
+    stats.record_success(1.0)
+    stats.record_cancelled(0.01)
+    assert stats.ewma_ms == 1000
+    stats.record_cancelled(2.0)
+    assert stats.ewma_ms == 2000
@@ -0,0 +1,54 @@
+"""Nöbet günü zamanlaması (scheduler.next_refresh_delay) testleri."""
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, timedelta
+
+from custom_components.haswave_nobetci_eczane.scheduler import (
+    LATE_RETRY_INTERVAL,
+    RETRY_INTERVAL,
+    RETRY_JITTER,
+    SLEEP_JITTER,
+    TR_TZ,
+    awaiting_changeover,
+    next_refresh_delay,
+)
+
+TODAY = date(2026, 10, 18)
+
+
+def _at(hour: int, minute: int = 0, day: date = TODAY) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=TR_TZ)
+
+
+def _delay(now: datetime, changed_on: date | None) -> timedelta:
+    return next_refresh_delay(now, changed_on, random.Random(1))
+
+
+def test_window_retries_until_change_seen() -> None:
+    delay = _delay(_at(8, 10), TODAY - timedelta(days=1))
+    assert RETRY_INTERVAL <= delay <= RETRY_INTERVAL + RETRY_JITTER
+
+
+def test_change_seen_sleeps_until_next_window() -> None:
+    delay = _delay(_at(8, 40), TODAY)
+    assert timedelta(hours=23, minutes=20) <= delay <= timedelta(hours=23, minutes=20) + SLEEP_JITTER
+
+
+def test_late_update_keeps_retrying_after_window() -> None:
+    # Pencere yeni liste görülmeden geçti (HA 10:05'te açıldı / site geç güncelledi)
+    for changed_on in (None, TODAY - timedelta(days=1)):
+        delay = _delay(_at(10, 5), changed_on)
+        assert LATE_RETRY_INTERVAL <= delay <= LATE_RETRY_INTERVAL + SLEEP_JITTER
+    assert awaiting_changeover(_at(15, 0), None)
+
+
+def test_late_change_seen_sleeps_until_next_window() -> None:
+    delay = _delay(_at(14, 0), TODAY)
+    assert timedelta(hours=18) <= delay <= timedelta(hours=18) + SLEEP_JITTER
+
+
+def test_before_window_sleeps_until_window() -> None:
+    delay = _delay(_at(0, 30), TODAY - timedelta(days=1))
+    assert not awaiting_changeover(_at(0, 30), None)
+    assert timedelta(hours=7, minutes=30) <= delay <= timedelta(hours=7, minutes=30) + SLEEP_JITTER